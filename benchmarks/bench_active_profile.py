@@ -0,0 +1,91 @@
+"""
+Benchmark: switching the active profile and looking it up on a large table.
+
+Compares the original schema and statements (no indexes, update_profile
+rewriting every other row, fetch_active_profile scanning the table) with the
+partial unique index and set_active_profile.
+
+Usage:
+    python benchmarks/bench_active_profile.py [--profiles 100000] [--switches 200]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db  # noqa: E402
+
+
+def populate(conn, count):
+    conn.execute("CREATE TABLE IF NOT EXISTS profiles (id INTEGER PRIMARY KEY, active BOOLEAN, dll_path TEXT, token_name TEXT)")
+    with conn:
+        conn.executemany(
+            "INSERT INTO profiles (active, dll_path, token_name) VALUES (?, ?, ?)",
+            ((i == 0, f"C:/tokens/token{i}.dll", f"token-{i}") for i in range(count))
+        )
+
+
+def legacy_switch(conn, profile_id):
+    # The original update_profile: two UPDATEs, the second touching every row.
+    with conn:
+        conn.execute("UPDATE profiles SET active = ? WHERE id = ?", (True, profile_id))
+        conn.execute("UPDATE profiles SET active = ? WHERE id != ?", (False, profile_id))
+
+
+def timed(label, func, ids):
+    start = time.perf_counter()
+    for profile_id in ids:
+        func(profile_id)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<38} {len(ids) / elapsed:>10.0f} ops/sec   ({elapsed * 1000 / len(ids):.3f} ms/op)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--switches", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    ids = [rng.randint(1, args.profiles) for _ in range(args.switches)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        legacy = sqlite3.connect(legacy_path)
+        for pragma in db.CONNECTION_PRAGMAS:
+            legacy.execute(pragma)
+        populate(legacy, args.profiles)
+
+        db.set_db_path(os.path.join(tmp, "indexed.db"))
+        populate(db.get_connection(), args.profiles)
+        db.initialize_db()
+        conn = db.get_connection()
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM profiles WHERE active = 1 LIMIT 1").fetchall()
+
+        print(f"{args.profiles} profiles, {args.switches} switches")
+        print(f"  active lookup plan: {plan[0][-1]}")
+        print("Switch active profile")
+        before = legacy.total_changes
+        timed("legacy update_profile (2 UPDATEs)", lambda i: legacy_switch(legacy, i), ids)
+        print(f"    rows written per switch: {(legacy.total_changes - before) / len(ids):.0f}")
+        before = conn.total_changes
+        timed("set_active_profile", db.set_active_profile, ids)
+        print(f"    rows written per switch: {(conn.total_changes - before) / len(ids):.1f}")
+
+        print("Fetch active profile")
+        lookups = range(args.switches * 10)
+        timed("legacy full scan", lambda _: legacy.execute(
+            "SELECT * FROM profiles WHERE active = 1 LIMIT 1").fetchone(), lookups)
+        timed("partial index", lambda _: db.fetch_active_profile(), lookups)
+
+        legacy.close()
+        db.close_connections()
+
+
+if __name__ == "__main__":
+    main()
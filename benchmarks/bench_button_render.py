@@ -0,0 +1,121 @@
+"""
+Benchmark: cost of the dashboard's canvas buttons on hover and creation.
+
+Compares the previous rounded button, which deleted and redrew its 13 canvas
+items on every <Enter>/<Leave>, with DashboardApp._create_rounded_button,
+which draws once and recolors with itemconfigure (and does nothing when the
+colors are unchanged). Also times creating a form's worth of buttons, which
+measured the font for every button before sizes were cached.
+
+Needs a display; on a headless machine run it under a virtual X server:
+    xvfb-run -a python benchmarks/bench_button_render.py [--hovers 2000] [--buttons 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tkinter as tk  # noqa: E402
+from tkinter import font as tkfont  # noqa: E402
+
+from ui.dashboard import DashboardApp  # noqa: E402
+
+FONT = ("Segoe UI", 10, "bold")
+
+
+def legacy_button(parent, text, bg, hover_bg, fg="black", padding_x=20, padding_y=10, radius=15):
+    """The button as it was: measure the font, then redraw everything per state."""
+    parent_bg = parent.cget("bg")
+    font_obj = tkfont.Font(font=FONT)
+    width = font_obj.measure(text) + padding_x * 2
+    height = font_obj.metrics("linespace") + padding_y * 2
+    canvas = tk.Canvas(parent, width=width, height=height, bg=parent_bg, highlightthickness=0, bd=0)
+
+    def draw_button(fill_color, text_color=None):
+        canvas.delete("btn")
+        r, w, h, pb = radius, width, height, parent_bg
+        canvas.create_arc(-1, -1, 2*r+1, 2*r+1, start=90, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
+        canvas.create_arc(w-2*r-1, -1, w+1, 2*r+1, start=0, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
+        canvas.create_arc(-1, h-2*r-1, 2*r+1, h+1, start=180, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
+        canvas.create_arc(w-2*r-1, h-2*r-1, w+1, h+1, start=270, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
+        canvas.create_rectangle(r, -1, w-r, h+1, fill=pb, outline=pb, tags="btn")
+        canvas.create_rectangle(-1, r, w+1, h-r, fill=pb, outline=pb, tags="btn")
+        canvas.create_arc(0, 0, 2*r, 2*r, start=90, extent=90, style="pieslice", fill=fill_color, outline=fill_color, tags="btn")
+        canvas.create_arc(w-2*r, 0, w, 2*r, start=0, extent=90, style="pieslice", fill=fill_color, outline=fill_color, tags="btn")
+        canvas.create_arc(0, h-2*r, 2*r, h, start=180, extent=90, style="pieslice", fill=fill_color, outline=fill_color, tags="btn")
+        canvas.create_arc(w-2*r, h-2*r, w, h, start=270, extent=90, style="pieslice", fill=fill_color, outline=fill_color, tags="btn")
+        canvas.create_rectangle(r, 0, w-r, h, fill=fill_color, outline=fill_color, tags="btn")
+        canvas.create_rectangle(0, r, w, h-r, fill=fill_color, outline=fill_color, tags="btn")
+        canvas.create_text(w/2, h/2, text=text, fill=(text_color or fg), font=FONT, tags=("btn", "label"))
+
+    draw_button(bg)
+    canvas.pack()
+    canvas.draw_button = draw_button
+    return canvas
+
+
+def make_app(root):
+    # Only the button helpers are exercised; skip DashboardApp.__init__ (and
+    # its database and window setup).
+    app = DashboardApp.__new__(DashboardApp)
+    app.root = root
+    app.font_button = FONT
+    app._button_font = None
+    app._button_sizes = {}
+    return app
+
+
+def time_ms(root, func):
+    start = time.perf_counter()
+    func()
+    root.update_idletasks()
+    return (time.perf_counter() - start) * 1000
+
+
+def hover(canvas, count, idle, active):
+    for _ in range(count):
+        canvas.draw_button(active, text_color="white")
+        canvas.draw_button(idle, text_color="black")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hovers", type=int, default=2000, help="enter/leave pairs per button")
+    parser.add_argument("--buttons", type=int, default=50, help="buttons created per run")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"No display ({e}); run under xvfb-run")
+    frame = tk.Frame(root, bg="#8c9bab")
+    frame.pack()
+    app = make_app(root)
+    labels = ["Save", "Cancel", "Import", "Export", "Add New Profile"]
+
+    old = legacy_button(frame, "Profile", "SystemButtonFace", "#22495e")
+    new = app._create_rounded_button(frame, "Profile", None, "SystemButtonFace", "#22495e", fg="black",
+                                     padding_x=20, padding_y=10, radius=15)
+    root.update()
+
+    print(f"{args.hovers} hover enter/leave pairs")
+    print(f"  redraw         {time_ms(root, lambda: hover(old, args.hovers, 'SystemButtonFace', '#22495e')):8.2f} ms")
+    print(f"  itemconfigure  {time_ms(root, lambda: hover(new, args.hovers, 'SystemButtonFace', '#22495e')):8.2f} ms")
+    print(f"  unchanged      {time_ms(root, lambda: [new.set_active(True) for _ in range(args.hovers * 2)]):8.2f} ms")
+
+    def create(factory):
+        buttons = [factory(labels[i % len(labels)]) for i in range(args.buttons)]
+        for button in buttons:
+            button.destroy()
+
+    print(f"{args.buttons} buttons created")
+    print(f"  measure each   {time_ms(root, lambda: create(lambda t: legacy_button(frame, t, '#43a047', '#378a3b'))):8.2f} ms")
+    print(f"  cached sizes   {time_ms(root, lambda: create(lambda t: app._create_rounded_button(frame, t, None, '#43a047', '#378a3b'))):8.2f} ms")
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
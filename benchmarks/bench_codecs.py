@@ -0,0 +1,81 @@
+"""
+Benchmark: encode/decode cost and payload size per codec for the event
+shapes the application publishes.
+
+Usage:
+    python benchmarks/bench_codecs.py [--iterations 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import codec  # noqa: E402
+
+TIMESTAMP = '2025-01-01T12:00:00.000000'
+
+KEY_SUBMITTED = {
+    'event_type': 'key_submitted',
+    'key_value': 'sample_key_12345',
+    'token_name': 'Production Token',
+    'user_id': None,
+    'timestamp': TIMESTAMP,
+}
+
+PROFILE_UPDATED = {
+    'event_type': 'profile_updated',
+    'profile_id': 42,
+    'profile_data': {'active': True, 'dll_path': '/usr/local/lib/libeToken.dylib', 'token_name': 'Production Token'},
+    'timestamp': TIMESTAMP,
+}
+
+PROFILE_DELETED = {
+    'event_type': 'profile_deleted',
+    'profile_id': 42,
+    'timestamp': TIMESTAMP,
+}
+
+# What EventProcessor publishes: the original event is embedded in full.
+KEY_PROCESSED = {
+    'event_type': 'key_processed',
+    'original_event': KEY_SUBMITTED,
+    'result': {'valid': True, 'length': 16, 'token_name': 'Production Token', 'processed_at': TIMESTAMP},
+    'timestamp': TIMESTAMP,
+}
+
+SHAPES = {
+    'key_submitted': KEY_SUBMITTED,
+    'profile_updated': PROFILE_UPDATED,
+    'profile_deleted': PROFILE_DELETED,
+    'key_processed': KEY_PROCESSED,
+}
+
+
+def per_op_us(fn, arg, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(arg)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"codecs available: {', '.join(codec.available_codecs())}")
+    print(f"{'shape':<16} {'codec':<8} {'bytes':>6} {'encode us':>10} {'decode us':>10}")
+    for shape, event in SHAPES.items():
+        for name in codec.available_codecs():
+            impl = codec.get_codec(name)
+            payload = impl.encode(event)
+            assert codec.decode(payload) == event
+            encode = per_op_us(impl.encode, event, args.iterations)
+            decode = per_op_us(codec.decode, payload, args.iterations)
+            print(f"{shape:<16} {name:<8} {len(payload):>6} {encode:>10.2f} {decode:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Micro-benchmark: per-call sqlite3.connect() versus the pooled connection layer.
+
+Simulates the event subscriber's handler threads hammering the profile
+lookups concurrently and reports ops/sec for both strategies.
+
+Usage:
+    python benchmarks/bench_db_connections.py [--threads 8] [--seconds 3] [--rows 500]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db  # noqa: E402
+
+
+def legacy_fetch_active_profile(path):
+    # Mirrors the original implementation: one connection per call.
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM profiles WHERE active = 1 LIMIT 1")
+    profile = cursor.fetchone()
+    conn.close()
+    return profile
+
+
+def legacy_fetch_profile_by_id(path, profile_id):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM profiles WHERE id = ?", (profile_id,))
+    profile = cursor.fetchone()
+    conn.close()
+    return profile
+
+
+def run_readers(work, threads, seconds):
+    """Run `work(i)` in a tight loop on N threads and return total ops/sec."""
+    counts = [0] * threads
+    stop = threading.Event()
+
+    def reader(slot):
+        i = 0
+        while not stop.is_set():
+            work(i)
+            i += 1
+        counts[slot] = i
+
+    workers = [threading.Thread(target=reader, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return sum(counts) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_profiles.db")
+        db.set_db_path(path)
+        db.initialize_db()
+        for i in range(args.rows):
+            db.insert_profile(1 if i == 0 else 0, f"/usr/lib/token{i}.dylib", f"Token {i}")
+
+        def legacy(i):
+            legacy_fetch_active_profile(path)
+            legacy_fetch_profile_by_id(path, i % args.rows + 1)
+
+        def pooled(i):
+            db.fetch_active_profile()
+            db.fetch_profile_by_id(i % args.rows + 1)
+
+        before = run_readers(legacy, args.threads, args.seconds)
+        after = run_readers(pooled, args.threads, args.seconds)
+        db.close_connections()
+
+    print(f"readers={args.threads} rows={args.rows} seconds={args.seconds}")
+    print(f"  connect-per-call : {before * 2:>12,.0f} queries/sec")
+    print(f"  pooled (WAL)     : {after * 2:>12,.0f} queries/sec")
+    print(f"  speedup          : {after / before:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
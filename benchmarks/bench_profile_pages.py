@@ -0,0 +1,86 @@
+"""
+Benchmark: cost of opening and searching the Profiles view on a large table.
+
+Compares loading every profile (fetch_profiles) with the first keyset page
+(fetch_profiles_page), both for the query alone and, when a display is
+available, including insertion into a ttk.Treeview. Also times the first
+page of search_profiles for prefixes typed one key at a time, against the
+LIKE scan a search box would otherwise need.
+
+Usage:
+    python benchmarks/bench_profile_pages.py [--profiles 100000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db  # noqa: E402
+
+
+def best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def fill_tree(tree, rows):
+    tree.delete(*tree.get_children())
+    for row in rows:
+        tree.insert("", "end", iid=str(row[0]), values=(row[0], "Yes" if int(row[1]) else "No", row[2], row[3], "Edit", "Delete"))
+    tree.update_idletasks()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.set_db_path(os.path.join(tmp, "profiles.db"))
+        db.initialize_db()
+        db.insert_profiles((f"C:/tokens/vendor{i % 37}/token{i}.dll", f"token-{i}") for i in range(args.profiles))
+
+        print(f"{args.profiles} profiles (best of {args.repeat})")
+        print(f"  query   fetch_profiles()           {best_of(args.repeat, db.fetch_profiles):8.2f} ms")
+        print(f"  query   fetch_profiles_page()      {best_of(args.repeat, db.fetch_profiles_page):8.2f} ms")
+        deep = args.profiles - db.PROFILE_PAGE_SIZE
+        print(f"  query   fetch_profiles_page(deep)  {best_of(args.repeat, lambda: db.fetch_profiles_page(deep)):8.2f} ms")
+
+        conn = db.get_connection()
+        typed = "token-4242"
+        for n in range(1, len(typed) + 1):
+            prefix = typed[:n]
+            fts = best_of(args.repeat, lambda: db.search_profiles(prefix))
+            like = best_of(args.repeat, lambda: conn.execute(
+                f"SELECT {db.PROFILE_COLUMNS} FROM profiles WHERE token_name LIKE ? OR dll_path LIKE ? LIMIT ?",
+                (f"%{prefix}%", f"%{prefix}%", db.PROFILE_PAGE_SIZE)).fetchall())
+            matches = len(db.search_profiles(prefix, limit=args.profiles))
+            print(f"  search  {prefix!r:<14} {matches:>7} matches   fts {fts:7.2f} ms   like {like:7.2f} ms")
+
+        try:
+            import tkinter as tk
+            from tkinter import ttk
+            root = tk.Tk()
+        except Exception as e:
+            print(f"  (Treeview timings skipped: {e})")
+        else:
+            root.withdraw()
+            tree = ttk.Treeview(root, columns=("ID", "Active", "DLL Path", "Token Name", "Edit", "Delete"), show="headings")
+            tree.pack()
+            print(f"  view    all rows into Treeview     {best_of(args.repeat, lambda: fill_tree(tree, db.fetch_profiles())):8.2f} ms")
+            print(f"  view    first page into Treeview   {best_of(args.repeat, lambda: fill_tree(tree, db.fetch_profiles_page())):8.2f} ms")
+            root.destroy()
+
+        db.close_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: one round-trip per publish versus pipelined batches.
+
+Requires a redis-server listening on localhost:6379.
+
+Usage:
+    python benchmarks/bench_publisher_pipeline.py [--events 20000] [--batch-size 100]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.event_publisher import BatchingPublisher, EventPublisher  # noqa: E402
+
+TOPIC = 'bench_publish'
+
+
+def make_event(i):
+    return {'event_type': 'profile_created', 'profile_id': i, 'profile_data': {'token_name': f'Token {i}', 'active': False}}
+
+
+def timed(label, events, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<26}: {events / elapsed:>12,.0f} events/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    publisher = EventPublisher()
+    n, size = args.events, args.batch_size
+    print(f"events={n} batch_size={size}")
+
+    def single():
+        for i in range(n):
+            publisher.publish(TOPIC, make_event(i))
+
+    def pipelined():
+        for start in range(0, n, size):
+            publisher.publish_many((TOPIC, make_event(i)) for i in range(start, min(start + size, n)))
+
+    def background():
+        flusher = BatchingPublisher(publisher, max_items=size, max_delay_ms=5)
+        futures = [flusher.publish(TOPIC, make_event(i)) for i in range(n)]
+        for future in futures:
+            future.result()
+        flusher.close()
+
+    timed("publish() per event", n, single)
+    timed("publish_many() pipelined", n, pipelined)
+    timed("BatchingPublisher", n, background)
+    publisher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: thread-per-message dispatch versus the bounded worker pool.
+
+By default events are injected straight into the dispatcher (no Redis needed)
+so the numbers isolate dispatch overhead. With --redis, events go end to end
+through a local redis-server using EventPublisher and EventSubscriber.
+
+Usage:
+    python benchmarks/bench_subscriber_dispatch.py [--events 50000] [--workers 8]
+    python benchmarks/bench_subscriber_dispatch.py --redis [--events 50000]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.dispatch import BoundedWorkerPool  # noqa: E402
+
+
+class Counter:
+    def __init__(self, target):
+        self.target = target
+        self.count = 0
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def handler(self, topic, event_data):
+        # Small amount of per-event work, similar to the example processors.
+        event_data.get('event_type', 'unknown')
+        with self.lock:
+            self.count += 1
+            if self.count >= self.target:
+                self.done.set()
+
+
+def make_event(i):
+    return {'event_type': 'profile_updated', 'profile_id': i % 100, 'profile_data': {'token_name': f'Token {i}'}}
+
+
+def bench_thread_per_message(events):
+    counter = Counter(events)
+    start = time.perf_counter()
+    for i in range(events):
+        threading.Thread(target=counter.handler, args=('profile_events', make_event(i)), daemon=True).start()
+    counter.done.wait(timeout=120)
+    return counter.count / (time.perf_counter() - start)
+
+
+def bench_pool(events, workers, queue_size):
+    counter = Counter(events)
+    pool = BoundedWorkerPool(max_workers=workers, max_queue_size=queue_size)
+    start = time.perf_counter()
+    for i in range(events):
+        pool.submit(counter.handler, 'profile_events', make_event(i))
+    counter.done.wait(timeout=120)
+    elapsed = time.perf_counter() - start
+    stats = pool.get_stats()
+    pool.shutdown()
+    return counter.count / elapsed, stats
+
+
+def bench_redis(events, workers, queue_size):
+    from services.event_publisher import EventPublisher
+    from services.event_subscriber import EventSubscriber
+
+    publisher = EventPublisher()
+    results = {}
+    for mode in ('thread', 'pool'):
+        counter = Counter(events)
+        subscriber = EventSubscriber(dispatch_mode=mode, max_workers=workers, max_queue_size=queue_size)
+        subscriber.subscribe(['bench_events'], counter.handler)
+        time.sleep(0.2)
+        start = time.perf_counter()
+        for i in range(events):
+            publisher.publish('bench_events', make_event(i))
+        counter.done.wait(timeout=120)
+        results[mode] = counter.count / (time.perf_counter() - start)
+        subscriber.close()
+    publisher.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--redis", action="store_true", help="run end to end against localhost:6379")
+    args = parser.parse_args()
+
+    if args.redis:
+        results = bench_redis(args.events, args.workers, args.queue_size)
+        print(f"end-to-end via Redis, events={args.events}")
+        for mode, rate in results.items():
+            print(f"  {mode:<7}: {rate:>12,.0f} events/sec")
+        return
+
+    per_message = bench_thread_per_message(args.events)
+    pooled, stats = bench_pool(args.events, args.workers, args.queue_size)
+    print(f"in-process dispatch, events={args.events} workers={args.workers} queue={args.queue_size}")
+    print(f"  thread-per-message : {per_message:>12,.0f} events/sec")
+    print(f"  bounded pool       : {pooled:>12,.0f} events/sec")
+    print(f"  pool stats         : {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,113 +10,136 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def connect_publisher():
+    """Return the shared publisher, or None if Redis does not answer."""
+    # get_publisher() connects lazily and never raises; ask Redis directly.
+    publisher = get_publisher()
+    if not publisher.ping():
+        logger.error("Failed to connect to Redis")
+        logger.error("Please make sure Redis is running on localhost:6379")
+        return None
+    return publisher
+
+
+def report_published(kind, results):
+    """Log how many of a demo's events were published; True if all were."""
+    sent = sum(1 for ok in results if ok)
+    if sent == len(results):
+        logger.info(f"{kind} events published!")
+        return True
+    logger.error(f"Only {sent} of {len(results)} {kind.lower()} events were published")
+    return False
+
+
 def demo_key_events():
     """Demonstrate key submission events."""
     logger.info("=== Key Submission Events Demo ===")
     
-    try:
-        publisher = get_publisher()
-    except Exception as e:
-        logger.error(f"Failed to connect to Redis: {e}")
-        logger.error("Please make sure Redis is running on localhost:6379")
-        return
+    publisher = connect_publisher()
+    if publisher is None:
+        return False
     
     # Publish some sample key submission events
     logger.info("Publishing sample key submission events...")
+    results = []
     
-    publisher.publish_key_submitted(
+    results.append(publisher.publish_key_submitted(
         key_value="sample_key_12345",
         token_name="Demo Token 1"
-    )
+    ))
     time.sleep(0.5)
     
-    publisher.publish_key_submitted(
+    results.append(publisher.publish_key_submitted(
         key_value="another_key_67890",
         token_name="Demo Token 2"
-    )
+    ))
     time.sleep(0.5)
     
-    publisher.publish_key_submitted(
+    results.append(publisher.publish_key_submitted(
         key_value="test_key_abcdef",
         token_name="Production Token"
-    )
+    ))
     
-    logger.info("Key submission events published!")
+    if not report_published("Key submission", results):
+        return False
     logger.info("\nTip: Run 'python event_processor.py' in another terminal to see these events processed.")
+    return True
 
 
 def demo_profile_events():
     """Demonstrate profile-related events."""
     logger.info("\n=== Profile Events Demo ===")
     
-    try:
-        publisher = get_publisher()
-    except Exception as e:
-        logger.error(f"Failed to connect to Redis: {e}")
-        return
+    publisher = connect_publisher()
+    if publisher is None:
+        return False
     
     # Publish some sample profile events
     logger.info("Publishing sample profile events...")
+    results = []
     
-    publisher.publish_profile_created(
+    results.append(publisher.publish_profile_created(
         profile_id=1,
         profile_data={
             'dll_path': '/path/to/demo.dll',
             'token_name': 'Demo Profile',
             'active': True
         }
-    )
+    ))
     time.sleep(0.5)
     
-    publisher.publish_profile_updated(
+    results.append(publisher.publish_profile_updated(
         profile_id=1,
         profile_data={
             'dll_path': '/path/to/updated_demo.dll',
             'token_name': 'Updated Demo Profile',
             'active': True
         }
-    )
+    ))
     time.sleep(0.5)
     
-    publisher.publish_profile_deleted(profile_id=1)
+    results.append(publisher.publish_profile_deleted(profile_id=1))
     
-    logger.info("Profile events published!")
+    if not report_published("Profile", results):
+        return False
     logger.info("\nTip: Run 'python event_processor.py' in another terminal to see these events processed.")
+    return True
 
 
 def demo_custom_events():
     """Demonstrate publishing custom events."""
     logger.info("\n=== Custom Events Demo ===")
     
-    try:
-        publisher = get_publisher()
-    except Exception as e:
-        logger.error(f"Failed to connect to Redis: {e}")
-        return
+    publisher = connect_publisher()
+    if publisher is None:
+        return False
     
     # Publish custom events to various topics
     logger.info("Publishing custom events...")
+    results = []
     
     # Custom event to 'user_actions' topic
-    publisher.publish('user_actions', {
+    results.append(publisher.publish('user_actions', {
         'event_type': 'button_clicked',
         'button_name': 'submit',
         'timestamp': '2024-01-01T10:00:00'
-    })
+    }))
     time.sleep(0.5)
     
     # Custom event to 'system_events' topic
-    publisher.publish('system_events', {
+    results.append(publisher.publish('system_events', {
         'event_type': 'system_startup',
         'mode': 'production',
         'configuration': {
             'database': 'connected',
             'redis': 'connected'
         }
-    })
+    }))
     
-    logger.info("Custom events published!")
+    if not report_published("Custom", results):
+        return False
     logger.info("\nTip: You can subscribe to 'user_actions' and 'system_events' topics using event_processor.py")
+    return True
 
 
 def main():
@@ -129,16 +152,17 @@ def main():
     print("in another terminal to see the events being processed.\n")
     
     try:
-        demo_key_events()
-        time.sleep(2)
-        
-        demo_profile_events()
-        time.sleep(2)
-        
-        demo_custom_events()
+        # Stop at the first demo whose events could not be published
+        completed = demo_key_events()
+        if completed:
+            time.sleep(2)
+            completed = demo_profile_events()
+        if completed:
+            time.sleep(2)
+            completed = demo_custom_events()
         
         print("\n" + "="*70)
-        print("Demo completed!")
+        print("Demo completed!" if completed else "Demo failed: events were not published.")
         print("="*70)
         print("\nTo process these events:")
         print("1. Make sure Redis is running (redis-server)")
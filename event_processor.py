@@ -4,14 +4,19 @@ Run this separately from the main application.
 """
 from services.event_publisher import get_publisher
 from services.event_subscriber import EventSubscriber, EventProcessor
+from services.profile_cache import profile_cache
 from ui.event_dashboard_launcher import (
     handle_key_submission_with_ui,
     handle_profile_event_with_ui,
     handle_processing_result_with_ui
 )
+import argparse
+import asyncio
 import logging
+import os
 import signal
 import sys
+import time
 
 logging.basicConfig(
     level=logging.INFO,
@@ -20,14 +25,23 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
-    """Main entry point for the event processor."""
+def run_threaded(partition=None, stats_queue=None):
+    """
+    Run the event processor with the thread-based subscriber.
+    
+    Args:
+        partition: (index, count) when running as one supervised worker
+        stats_queue: Queue the worker reports (index, stats) to
+    """
     logger.info("Starting Event Processor...")
     
     # Initialize publisher and subscriber
     try:
         publisher = get_publisher()
-        subscriber = EventSubscriber()
+        # The cache observes every profile event, not just this worker's
+        # partition, so launcher dashboards opened here never read stale rows.
+        subscriber = EventSubscriber(dispatch_mode='keyed', partition=partition,
+                                     observers={'profile_events': profile_cache.handle_profile_event})
         processor = EventProcessor(publisher, subscriber)
         logger.info("Event processor initialized successfully")
     except Exception as e:
@@ -69,6 +83,13 @@ def main():
     subscriber.subscribe_to_topics(topic_handlers)
     logger.info("Subscribed to all topics. Listening for events...")
     
+    def report_stats():
+        if stats_queue is not None:
+            stats_queue.put((partition[0], {
+                'processor': processor.get_stats(),
+                'dispatch': subscriber.get_dispatch_stats()
+            }))
+    
     # Set up signal handlers for graceful shutdown
     def signal_handler(sig, frame):
         logger.info("\nShutting down event processor...")
@@ -77,6 +98,8 @@ def main():
         subscriber.close()
         logger.info("Event processor stopped")
         logger.info(f"Final stats: {processor.get_stats()}")
+        logger.info(f"Dispatch stats: {subscriber.get_dispatch_stats()}")
+        report_stats()
         sys.exit(0)
     
     signal.signal(signal.SIGINT, signal_handler)
@@ -85,12 +108,97 @@ def main():
     # Keep the main thread alive
     try:
         while True:
-            import time
             time.sleep(1)
+            report_stats()
     except KeyboardInterrupt:
         signal_handler(None, None)
 
 
+def run_worker(index, count, stats_queue):
+    """Entry point of one supervised worker process."""
+    run_threaded(partition=(index, count), stats_queue=stats_queue)
+
+
+def run_supervised(workers):
+    """Run `workers` event processor processes under a supervisor."""
+    from services.process_supervisor import ProcessSupervisor
+    
+    logger.info(f"Starting Event Processor supervisor with {workers} workers...")
+    supervisor = ProcessSupervisor(run_worker, workers=workers)
+    supervisor.run_forever()
+
+
+async def run_async():
+    """Run the event processor on a single asyncio event loop."""
+    from services.async_events import AsyncEventPublisher, AsyncEventSubscriber
+    
+    logger.info("Starting Event Processor (asyncio)...")
+    publisher = AsyncEventPublisher()
+    subscriber = AsyncEventSubscriber()
+    try:
+        await publisher.connect()
+    except Exception as e:
+        logger.error(f"Failed to initialize event processor: {e}")
+        logger.error("Make sure Redis is running!")
+        sys.exit(1)
+    processor = EventProcessor(publisher, subscriber)
+    
+    async def handle_key_submission(topic: str, event_data: dict):
+        await processor.process_key_submission_async(topic, event_data)
+        await asyncio.to_thread(handle_key_submission_with_ui, topic, event_data)
+    
+    async def handle_profile_event(topic: str, event_data: dict):
+        profile_cache.handle_profile_event(topic, event_data)
+        await processor.process_profile_events_async(topic, event_data)
+        await asyncio.to_thread(handle_profile_event_with_ui, topic, event_data)
+    
+    topic_handlers = {
+        'key_submission': handle_key_submission,
+        'profile_events': handle_profile_event,
+        # Plain callables run in the default executor
+        'processing_results': handle_processing_result_with_ui
+    }
+    
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, subscriber.stop)
+        except NotImplementedError:
+            # Windows event loops do not support signal handlers
+            pass
+    
+    try:
+        await subscriber.run(topic_handlers)
+    finally:
+        logger.info("\nShutting down event processor...")
+        await subscriber.close()
+        await publisher.close()
+        logger.info("Event processor stopped")
+        logger.info(f"Final stats: {processor.get_stats()}")
+
+
+def main():
+    """Main entry point for the event processor."""
+    parser = argparse.ArgumentParser(description="Subscribe to Redis events and process them.")
+    parser.add_argument("--async", dest="use_asyncio", action="store_true",
+                        help="run handlers on one asyncio event loop instead of threads")
+    parser.add_argument("--supervise", action="store_true",
+                        help="run several worker processes and restart them if they crash")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes in --supervise mode (default: CPU count)")
+    args = parser.parse_args()
+    
+    if args.supervise:
+        run_supervised(args.workers)
+    elif args.use_asyncio:
+        try:
+            asyncio.run(run_async())
+        except KeyboardInterrupt:
+            pass
+    else:
+        run_threaded()
+
+
 if __name__ == "__main__":
     main()
 
@@ -1,7 +1,19 @@
-from ui.dashboard import DashboardApp
+from ui import startup  # first, so startup timings cover every import
+import argparse
 import tkinter as tk
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile dashboard")
+    parser.add_argument("--live", action="store_true", help="refresh live from profile_events (needs Redis)")
+    parser.add_argument("--startup-report", action="store_true", help="print startup phase timings and the slowest imports")
+    args = parser.parse_args()
+    if args.startup_report:
+        startup.enable()
+
+    from ui.dashboard import DashboardApp
+    startup.mark("imports")
     root = tk.Tk()
-    app = DashboardApp(root)
+    startup.mark("Tk root created")
+    app = DashboardApp(root, live_updates=args.live)
+    startup.mark("widgets built")
     root.protocol("WM_DELETE_WINDOW", app.close_app)  # Trigger close function on window close
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
@@ -0,0 +1,73 @@
+"""
+Outbox Relay - Standalone service that forwards committed events from the
+event_outbox table in profiles.db to Redis.
+Run this separately from the main application: profile changes made through
+services.crud only reach Redis (and so other dashboards and the event
+processor) while a relay is running.
+"""
+from services.crud import get_outbox
+from services.db import initialize_db
+from services.event_publisher import get_publisher
+from services.outbox import OutboxDrainer
+import argparse
+import logging
+import signal
+import sys
+import time
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point for the outbox relay."""
+    parser = argparse.ArgumentParser(description="Forward events from the profiles.db outbox to Redis.")
+    parser.add_argument("--batch-size", type=int, default=100, help="events per Redis pipeline (default: 100)")
+    parser.add_argument("--retry-interval", type=float, default=5.0,
+                        help="seconds between connection attempts while Redis is down (default: 5)")
+    args = parser.parse_args()
+    
+    logger.info("Starting Outbox Relay...")
+    initialize_db()
+    outbox = get_outbox()
+    
+    # Always 'redis' mode: a publisher that buffered or dropped events would
+    # report them as sent, and the drainer would delete them from the outbox.
+    publisher = get_publisher(mode='redis')
+    drainer = OutboxDrainer(outbox, publisher.publish_many, batch_size=args.batch_size)
+    
+    # Set up signal handlers for graceful shutdown
+    def signal_handler(sig, frame):
+        logger.info("\nShutting down outbox relay...")
+        drainer.stop()
+        publisher.close()
+        logger.info(f"Outbox relay stopped: {drainer.delivered} events delivered, "
+                    f"{outbox.pending_count()} still pending")
+        sys.exit(0)
+    
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+    
+    try:
+        # Events stay in the outbox while Redis is down; wait for it rather
+        # than exiting. (Later outages are retried by the drainer itself.)
+        while not publisher.ping():
+            logger.warning(f"Redis unavailable, retrying in {args.retry_interval:g}s "
+                           f"({outbox.pending_count()} events waiting)")
+            time.sleep(args.retry_interval)
+        
+        drainer.start()
+        logger.info(f"Relaying events ({outbox.pending_count()} pending)...")
+        
+        # Keep the main thread alive
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        signal_handler(None, None)
+
+
+if __name__ == "__main__":
+    main()
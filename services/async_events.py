@@ -0,0 +1,369 @@
+"""
+Asyncio counterparts of EventPublisher and EventSubscriber built on redis.asyncio.
+
+Handlers run as tasks on one event loop instead of one OS thread each, so a
+single process can keep thousands of handlers in flight. Topics listed in
+EVENT_STREAM_TOPICS go through Redis Streams exactly as in the threaded
+classes (see services.streams), so both kinds of processor interoperate.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import redis
+import redis.asyncio as aioredis
+
+from .codec import CodecError, decode, get_codec
+from .streams import (DEFAULT_GROUP, DEFAULT_MAXLEN, PAYLOAD_FIELD, configured_stream_topics,
+                      default_consumer_name, stream_key)
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+class AsyncEventPublisher:
+    """
+    Asyncio event publisher that publishes events to Redis topics.
+    """
+
+    def __init__(self, host='localhost', port=6379, db=0, codec='json',
+                 stream_topics: Optional[Iterable[str]] = None, stream_maxlen: int = DEFAULT_MAXLEN):
+        """
+        Initialize the publisher. The connection is opened lazily by the pool;
+        call `connect()` to verify it up front.
+
+        Args:
+            host: Redis host (default: localhost)
+            port: Redis port (default: 6379)
+            db: Redis database number (default: 0)
+            codec: Payload codec name (see services.codec)
+            stream_topics: Topics published to Redis Streams instead of
+                pub/sub (default: EVENT_STREAM_TOPICS, see services.streams)
+            stream_maxlen: Approximate number of entries kept per stream
+                (default: 10000)
+        """
+        self.codec = get_codec(codec)
+        self.stream_topics = set(stream_topics) if stream_topics is not None else configured_stream_topics()
+        self.stream_maxlen = stream_maxlen
+        self.host = host
+        self.port = port
+        self.redis_client = aioredis.Redis(host=host, port=port, db=db, decode_responses=True)
+
+    async def connect(self):
+        """Ping Redis, raising redis.ConnectionError if it is unreachable."""
+        try:
+            await self.redis_client.ping()
+            logger.info(f"Connected to Redis at {self.host}:{self.port}")
+        except redis.ConnectionError as e:
+            logger.error(f"Failed to connect to Redis: {e}")
+            raise
+
+    async def publish(self, topic: str, event: Dict[str, Any]) -> bool:
+        """
+        Publish an event to a Redis topic.
+
+        Args:
+            topic: The topic/channel to publish to
+            event: Dictionary containing event data
+
+        Returns:
+            bool: True if published successfully, False otherwise
+        """
+        try:
+            await self._send(self.redis_client, topic, self._serialize(event))
+            logger.debug(f"Published event to topic '{topic}': {event.get('event_type', 'unknown')}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to publish event to topic '{topic}': {e}")
+            return False
+
+    async def publish_many(self, events: Iterable[Tuple[str, Dict[str, Any]]]) -> List[bool]:
+        """
+        Publish several events in one round-trip using a pipeline.
+
+        Args:
+            events: Iterable of (topic, event) pairs
+
+        Returns:
+            List[bool]: Per-event result, in input order
+        """
+        events = list(events)
+        if not events:
+            return []
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for topic, event in events:
+                    self._send(pipe, topic, self._serialize(event))
+                replies = await pipe.execute(raise_on_error=False)
+        except Exception as e:
+            logger.error(f"Failed to publish batch of {len(events)} events: {e}")
+            return [False] * len(events)
+        return [not isinstance(reply, Exception) for reply in replies]
+
+    def _send(self, client, topic: str, payload: bytes):
+        """Issue the publish command for a topic's transport; await the result on a client."""
+        if topic in self.stream_topics:
+            return client.xadd(stream_key(topic), {PAYLOAD_FIELD: payload},
+                               maxlen=self.stream_maxlen, approximate=True)
+        return client.publish(topic, payload)
+
+    def _serialize(self, event: Dict[str, Any]) -> bytes:
+        """Add a timestamp (unless present) and encode the event with the configured codec."""
+        from datetime import datetime
+        return self.codec.encode({**event, 'timestamp': event.get('timestamp', datetime.now().isoformat())})
+
+    async def close(self):
+        """Close the Redis connection pool."""
+        await self.redis_client.aclose()
+        logger.info("Redis connection closed")
+
+
+class AsyncEventSubscriber:
+    """
+    Asyncio event subscriber.
+
+    Either iterate over events directly:
+
+        async for topic, event_data in subscriber:
+            ...
+
+    or hand a topic -> handler mapping to `run()`, which accepts both
+    coroutine functions and plain callables.
+
+    Stream-backed topics are read through the consumer group and acknowledged
+    only once handled: by `run()` after the handler succeeds, and by the
+    iterator when the loop asks for the next event.
+    """
+
+    def __init__(self, host='localhost', port=6379, db=0, max_in_flight: int = 1000,
+                 stream_topics: Optional[Iterable[str]] = None, consumer_group: str = DEFAULT_GROUP,
+                 consumer_name: Optional[str] = None, batch_size: int = 100, block_ms: int = 1000,
+                 claim_idle_ms: int = 60000, claim_interval: float = 30.0):
+        """
+        Initialize the subscriber.
+
+        Args:
+            host: Redis host (default: localhost)
+            port: Redis port (default: 6379)
+            db: Redis database number (default: 0)
+            max_in_flight: Maximum handlers running concurrently in `run()` (default: 1000)
+            stream_topics: Topics consumed from Redis Streams through a
+                consumer group instead of pub/sub (default:
+                EVENT_STREAM_TOPICS, see services.streams)
+            consumer_group: Consumer group shared by all processor instances
+            consumer_name: This consumer's name (default: host-pid)
+            batch_size: Maximum stream entries fetched per XREADGROUP (default: 100)
+            block_ms: How long XREADGROUP blocks waiting for entries (default: 1000)
+            claim_idle_ms: Pending entries idle this long are reclaimed (default: 60000)
+            claim_interval: Seconds between reclaim passes (default: 30)
+        """
+        # Raw bytes: payloads may come from a binary codec (see services.codec)
+        self.redis_client = aioredis.Redis(host=host, port=port, db=db, decode_responses=False)
+        self.pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        self.max_in_flight = max_in_flight
+        self.stream_topics = set(stream_topics) if stream_topics is not None else configured_stream_topics()
+        self.consumer_group = consumer_group
+        self.consumer_name = consumer_name or default_consumer_name()
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval = claim_interval
+        self.running = False
+        self._tasks = set()
+        self._pubsub_topics = []
+        self._streamed_topics = []
+
+    async def subscribe(self, topics: Iterable[str]):
+        """Subscribe to one or more topics."""
+        topics = list(topics)
+        pubsub_topics = [t for t in topics if t not in self.stream_topics]
+        streamed_topics = [t for t in topics if t in self.stream_topics]
+        if pubsub_topics:
+            await self.pubsub.subscribe(*pubsub_topics)
+            self._pubsub_topics.extend(t for t in pubsub_topics if t not in self._pubsub_topics)
+        for topic in streamed_topics:
+            try:
+                # id='0' so a new group also sees entries published before it existed
+                await self.redis_client.xgroup_create(stream_key(topic), self.consumer_group, id='0', mkstream=True)
+                logger.info(f"Created consumer group '{self.consumer_group}' on stream for topic: {topic}")
+            except redis.ResponseError as e:
+                if 'BUSYGROUP' not in str(e):
+                    raise
+            if topic not in self._streamed_topics:
+                self._streamed_topics.append(topic)
+        self.running = True
+        for topic in topics:
+            logger.info(f"Subscribed to topic: {topic}")
+
+    def __aiter__(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        return self.events()
+
+    async def events(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (topic, event_data) for every message on the subscribed topics."""
+        async for topic, event_data, ack in self._entries():
+            yield topic, event_data
+            if ack is not None:
+                # The loop body is done with the entry.
+                await ack()
+
+    async def _entries(self) -> AsyncIterator[Tuple[str, Dict[str, Any], Optional[Callable[[], Awaitable[None]]]]]:
+        """Yield (topic, event_data, ack) from pub/sub and streams; ack is None for pub/sub."""
+        # Bounded, so a slow consumer stops the stream reader fetching more.
+        entries = asyncio.Queue(maxsize=self.batch_size)
+        readers = []
+        if self._pubsub_topics:
+            readers.append(asyncio.create_task(self._read_pubsub(entries)))
+        if self._streamed_topics:
+            readers.append(asyncio.create_task(self._read_streams(entries)))
+        try:
+            while self.running:
+                try:
+                    yield await asyncio.wait_for(entries.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+        finally:
+            for reader in readers:
+                reader.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+
+    async def _read_pubsub(self, entries: asyncio.Queue):
+        while self.running:
+            message = await self.pubsub.get_message(timeout=1.0)
+            if message is None or message['type'] != 'message':
+                continue
+            topic = message['channel'].decode('utf-8')
+            try:
+                event_data = decode(message['data'])
+            except CodecError as e:
+                logger.error(f"Failed to parse event payload: {e}")
+                continue
+            logger.debug(f"Received event on topic '{topic}': {event_data.get('event_type', 'unknown')}")
+            await entries.put((topic, event_data, None))
+
+    async def _read_streams(self, entries: asyncio.Queue):
+        topic_by_key = {stream_key(topic).encode('utf-8'): topic for topic in self._streamed_topics}
+        # Entries delivered to this consumer name before a restart come first.
+        last_id = '0'
+        last_claim = time.monotonic()
+        while self.running:
+            try:
+                streams = {stream_key(topic): last_id for topic in self._streamed_topics}
+                response = await self.redis_client.xreadgroup(
+                    self.consumer_group, self.consumer_name, streams,
+                    count=self.batch_size, block=self.block_ms if last_id == '>' else None
+                )
+                for key, stream_entries in response or []:
+                    for entry_id, fields in stream_entries:
+                        await self._deliver(entries, topic_by_key[key], entry_id, fields)
+                last_id = '>'
+                if time.monotonic() - last_claim >= self.claim_interval:
+                    await self._reclaim_pending(entries)
+                    last_claim = time.monotonic()
+            except redis.ConnectionError as e:
+                if not self.running:
+                    break  # closed under us by close()
+                logger.error(f"Lost connection while reading streams: {e}")
+                await asyncio.sleep(1)
+            except Exception as e:
+                logger.error(f"Error in stream consumer: {e}", exc_info=True)
+                await asyncio.sleep(1)
+
+    async def _reclaim_pending(self, entries: asyncio.Queue):
+        """Take over entries other consumers left unacknowledged for too long."""
+        reclaimed = 0
+        for topic in self._streamed_topics:
+            start_id = '0-0'
+            while True:
+                result = await self.redis_client.xautoclaim(
+                    stream_key(topic), self.consumer_group, self.consumer_name,
+                    min_idle_time=self.claim_idle_ms, start_id=start_id, count=self.batch_size
+                )
+                start_id, claimed = result[0], result[1]
+                for entry_id, fields in claimed:
+                    await self._deliver(entries, topic, entry_id, fields)
+                    reclaimed += 1
+                if not claimed or start_id in (b'0-0', '0-0'):
+                    break
+        if reclaimed:
+            logger.warning(f"Reclaimed {reclaimed} pending stream entries")
+
+    async def _deliver(self, entries: asyncio.Queue, topic: str, entry_id: bytes, fields: Dict[bytes, bytes]):
+        key = stream_key(topic)
+
+        async def ack():
+            try:
+                await self.redis_client.xack(key, self.consumer_group, entry_id)
+            except Exception as e:
+                # Unacknowledged entries are redelivered; log and carry on.
+                logger.error(f"Failed to acknowledge stream entry {entry_id!r} on topic '{topic}': {e}")
+
+        if not fields or PAYLOAD_FIELD not in fields:
+            # Trimmed or malformed entry: nothing to process, drop it.
+            await ack()
+            return
+        try:
+            event_data = decode(fields[PAYLOAD_FIELD])
+        except CodecError as e:
+            logger.error(f"Failed to parse stream entry {entry_id!r} on topic '{topic}': {e}")
+            await ack()
+            return
+        logger.debug(f"Received stream event on topic '{topic}': {event_data.get('event_type', 'unknown')}")
+        await entries.put((topic, event_data, ack))
+
+    async def run(self, topic_handlers: Dict[str, Handler]):
+        """
+        Subscribe to the mapping's topics and dispatch events until `stop()`.
+
+        Coroutine handlers run as tasks (at most `max_in_flight` at a time);
+        plain callables run in the default thread pool executor.
+
+        Args:
+            topic_handlers: Dictionary mapping topic names to handler functions
+        """
+        await self.subscribe(topic_handlers.keys())
+        slots = asyncio.Semaphore(self.max_in_flight)
+        logger.info("Async event listener started with multiple handlers")
+
+        async for topic, event_data, ack in self._entries():
+            handler = topic_handlers.get(topic)
+            if handler is None:
+                logger.warning(f"No handler registered for topic: {topic}")
+                continue
+            await slots.acquire()
+            task = asyncio.create_task(self._safe_call_handler(topic, event_data, handler, ack))
+            self._tasks.add(task)
+            task.add_done_callback(lambda t: (self._tasks.discard(t), slots.release()))
+
+    async def _safe_call_handler(self, topic: str, event_data: Dict[str, Any], handler: Handler,
+                                 ack: Optional[Callable[[], Awaitable[None]]] = None):
+        """Safely call a sync or async handler with error handling."""
+        try:
+            if asyncio.iscoroutinefunction(handler):
+                await handler(topic, event_data)
+            else:
+                await asyncio.to_thread(handler, topic, event_data)
+        except Exception as e:
+            # Raising skips the ack; a stream entry stays pending and is redelivered.
+            logger.error(f"Error in event handler: {e}", exc_info=True)
+            return
+        if ack is not None:
+            await ack()
+
+    def in_flight(self) -> int:
+        """Number of handlers currently running."""
+        return len(self._tasks)
+
+    def stop(self):
+        """Stop iterating; `run()` returns after the current poll."""
+        self.running = False
+
+    async def close(self, timeout: Optional[float] = 5.0):
+        """Stop, wait for in-flight handlers and close the Redis connection."""
+        self.stop()
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=timeout)
+        await self.pubsub.aclose()
+        await self.redis_client.aclose()
+        logger.info("Redis connection closed")
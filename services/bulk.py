@@ -0,0 +1,259 @@
+"""
+Bulk profile import and export (CSV and JSONL).
+
+Files are streamed in chunks, never loaded whole. An import validates each
+chunk's dll_path values in parallel, inserts the chunk with one executemany,
+and commits everything in a single transaction together with one aggregated
+``profiles_imported`` outbox event. Progress is reported through an optional
+callback so a UI can show it without blocking on the work.
+"""
+import csv
+import io
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from . import db
+from .crud import get_outbox
+from .events import PROFILE_TOPIC, build_profile_event
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('id', 'active', 'dll_path', 'token_name')
+
+# Called as progress(rows_done, fraction) with fraction in [0, 1].
+ProgressCallback = Callable[[int, float], None]
+
+
+class ImportResult(NamedTuple):
+    imported: int
+    skipped: List[Tuple[int, str]]   # (line number, reason)
+    active_id: Optional[int]
+
+
+def detect_format(path: str) -> str:
+    """'csv' or 'jsonl' from the file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if ext == '.csv':
+        return 'csv'
+    raise ValueError(f"Unsupported profile file type: {ext or path} (use .csv or .jsonl)")
+
+
+def _parse_active(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y')
+    return bool(value)
+
+
+class _LineReader:
+    """
+    Decodes a binary file line by line, counting bytes consumed (for progress)
+    and lines. Lines that are not UTF-8 are left out and collected in
+    `undecodable` so the caller can report them.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+        self.line_no = 0
+        self.undecodable = []
+
+    def lines(self) -> Iterator[str]:
+        encoding = 'utf-8-sig'  # drop a BOM at the start of the file
+        for line in self.raw:
+            self.bytes_read += len(line)
+            self.line_no += 1
+            try:
+                text = line.decode(encoding)
+            except UnicodeDecodeError as e:
+                self.undecodable.append((self.line_no, f"not UTF-8: {e.reason}"))
+                continue
+            finally:
+                encoding = 'utf-8'
+            yield text
+
+    def take_undecodable(self) -> List[Tuple[int, None, str]]:
+        bad = [(line_no, None, reason) for line_no, reason in self.undecodable]
+        self.undecodable.clear()
+        return bad
+
+
+# (line number, record, None) for a parsed record, or
+# (line number, None, reason) for a line that could not be parsed.
+_Entry = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def _read_records(reader: _LineReader, fmt: str) -> Iterator[_Entry]:
+    if fmt == 'csv':
+        rows = csv.DictReader(reader.lines())
+        while True:
+            try:
+                record, error = next(rows), None
+            except StopIteration:
+                break
+            except csv.Error as e:
+                # The reader resumes at the next line.
+                record, error = None, f"malformed CSV: {e}"
+            yield from reader.take_undecodable()
+            # line_no is the record's last line (quoted fields may span lines)
+            yield reader.line_no, record, error
+    else:
+        for line in reader.lines():
+            yield from reader.take_undecodable()
+            if not line.strip():
+                continue
+            try:
+                yield reader.line_no, json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield reader.line_no, None, f"malformed JSON: {e.msg}"
+    yield from reader.take_undecodable()
+
+
+def _field(record: Any, name: str) -> str:
+    value = record.get(name) if isinstance(record, dict) else None
+    return str(value).strip() if value is not None else ''
+
+
+def _validate(record: Any, exists: bool, require_existing: bool) -> Optional[str]:
+    if not isinstance(record, dict):
+        return "not an object"
+    if not _field(record, 'dll_path'):
+        return "missing dll_path"
+    if not _field(record, 'token_name'):
+        return "missing token_name"
+    if require_existing and not exists:
+        return f"dll_path not found: {_field(record, 'dll_path')}"
+    return None
+
+
+def import_profiles(path: str, fmt: Optional[str] = None, chunk_size: int = 500,
+                    max_workers: int = 8, require_existing: bool = True,
+                    progress: Optional[ProgressCallback] = None) -> ImportResult:
+    """
+    Import profiles from a CSV or JSONL file in one transaction.
+
+    Records need dll_path and token_name; active is optional and, when several
+    records are active, the last one becomes the active profile. Invalid
+    records and malformed lines are skipped and reported by line number
+    rather than aborting the import.
+
+    Args:
+        path: File to read
+        fmt: 'csv' or 'jsonl' (default: from the extension)
+        chunk_size: Records validated and inserted per batch (default: 500)
+        max_workers: Threads checking dll_path existence (default: 8)
+        require_existing: Skip records whose dll_path is not a file (default: True)
+        progress: Optional progress callback
+
+    Returns:
+        ImportResult with the imported count, skipped records and new active ID
+    """
+    fmt = fmt or detect_format(path)
+    total_bytes = os.path.getsize(path) or 1
+    imported = 0
+    skipped = []
+    first_id = last_id = active_id = None
+    records_done = 0
+    outbox = get_outbox()
+
+    with open(path, 'rb') as raw, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        reader = _LineReader(raw)
+        entries = _read_records(reader, fmt)
+        with db.transaction() as conn:
+            while True:
+                chunk = list(islice(entries, chunk_size))
+                if not chunk:
+                    break
+
+                # os.path.isfile blocks on slow or network drives; check the
+                # whole chunk concurrently.
+                paths = [_field(record, 'dll_path') for _, record, _ in chunk]
+                exists = executor.map(os.path.isfile, paths) if require_existing else [True] * len(chunk)
+
+                rows = []
+                chunk_active = None
+                for (line_no, record, error), path_exists in zip(chunk, exists):
+                    records_done += 1
+                    reason = error or _validate(record, path_exists, require_existing)
+                    if reason:
+                        skipped.append((line_no, reason))
+                        continue
+                    if _parse_active(record.get('active')):
+                        chunk_active = len(rows)
+                    rows.append((_field(record, 'dll_path'), _field(record, 'token_name')))
+
+                ids = db.insert_profiles(rows)
+                if ids:
+                    first_id = ids[0] if first_id is None else first_id
+                    last_id = ids[-1]
+                    imported += len(ids)
+                if chunk_active is not None:
+                    active_id = ids[chunk_active]
+
+                if progress:
+                    progress(records_done, min(reader.bytes_read / total_bytes, 1.0))
+
+            if active_id is not None:
+                db.set_active_profile(active_id)
+            if imported:
+                event = build_profile_event('profiles_imported', None, {
+                    'count': imported, 'first_id': first_id, 'last_id': last_id, 'active_id': active_id,
+                })
+                outbox.append(PROFILE_TOPIC, event, conn=conn)
+    outbox.notify()
+
+    logger.info(f"Imported {imported} profiles from {path} ({len(skipped)} skipped)")
+    return ImportResult(imported, skipped, active_id)
+
+
+def export_profiles(path: str, fmt: Optional[str] = None, batch_size: int = 1000,
+                    progress: Optional[ProgressCallback] = None) -> int:
+    """
+    Export every profile to a CSV or JSONL file.
+
+    Rows are streamed from one SELECT with fetchmany, so the export is a
+    consistent snapshot and memory use does not grow with the table.
+
+    Args:
+        path: File to write (replaced if it exists)
+        fmt: 'csv' or 'jsonl' (default: from the extension)
+        batch_size: Rows fetched per round trip (default: 1000)
+        progress: Optional progress callback
+
+    Returns:
+        int: Number of profiles written
+    """
+    fmt = fmt or detect_format(path)
+    conn = db.get_connection()
+    total = conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0] or 1
+    cursor = conn.execute(f"SELECT {db.PROFILE_COLUMNS} FROM profiles ORDER BY id")
+    written = 0
+
+    with open(path, 'w', encoding='utf-8', newline='') as out:
+        writer = csv.writer(out) if fmt == 'csv' else None
+        if writer:
+            writer.writerow(FIELDS)
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            if writer:
+                writer.writerows((pid, int(active or 0), dll, token) for pid, active, dll, token in batch)
+            else:
+                buffer = io.StringIO()
+                for pid, active, dll, token in batch:
+                    record = {'id': pid, 'active': bool(int(active or 0)), 'dll_path': dll, 'token_name': token}
+                    buffer.write(json.dumps(record))
+                    buffer.write('\n')
+                out.write(buffer.getvalue())
+            written += len(batch)
+            if progress:
+                progress(written, min(written / total, 1.0))
+
+    logger.info(f"Exported {written} profiles to {path}")
+    return written
@@ -0,0 +1,119 @@
+"""
+Event payload codecs shared by the publishers and subscribers.
+
+Wire format: JSON payloads are sent as-is (they always start with '{'), so
+any JSON codec can read what any other JSON codec wrote and older
+subscribers keep working. Binary codecs prefix the payload with a one-byte
+header that identifies them; `decode()` picks the codec from that byte.
+"""
+import json
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+Payload = Union[bytes, str]
+
+MSGPACK_HEADER = b'\x01'
+
+
+class CodecError(ValueError):
+    """Raised when a payload cannot be encoded or decoded."""
+
+
+class JSONCodec:
+    """Standard library JSON (the default)."""
+
+    name = 'json'
+    header = b''
+
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        return json.dumps(event, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, payload: Payload) -> Dict[str, Any]:
+        return json.loads(payload)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON via orjson; wire compatible with JSONCodec."""
+
+    name = 'orjson'
+
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        return orjson.dumps(event)
+
+    def decode(self, payload: Payload) -> Dict[str, Any]:
+        return orjson.loads(payload)
+
+
+class MsgpackCodec:
+    """MessagePack, prefixed with MSGPACK_HEADER."""
+
+    name = 'msgpack'
+    header = MSGPACK_HEADER
+
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        return self.header + msgpack.packb(event, use_bin_type=True)
+
+    def decode(self, payload: Payload) -> Dict[str, Any]:
+        return msgpack.unpackb(payload[len(self.header):], raw=False)
+
+
+_AVAILABLE = {'json': JSONCodec()}
+if orjson is not None:
+    _AVAILABLE['orjson'] = OrjsonCodec()
+if msgpack is not None:
+    _AVAILABLE['msgpack'] = MsgpackCodec()
+
+# Decoder used for header-less (JSON) payloads: the fastest JSON codec installed.
+_JSON_DECODER = _AVAILABLE.get('orjson', _AVAILABLE['json'])
+
+
+def available_codecs():
+    """Names of the codecs usable in this environment."""
+    return list(_AVAILABLE)
+
+
+def get_codec(name: Optional[str] = 'json'):
+    """
+    Look up a codec by name.
+
+    Args:
+        name: 'json', 'orjson', 'msgpack', or 'auto' for the fastest JSON
+            codec installed (JSON keeps payloads readable by every subscriber)
+
+    Raises:
+        ValueError: If the codec is unknown or its package is not installed
+    """
+    if name is None or name == 'auto':
+        return _JSON_DECODER
+    codec = _AVAILABLE.get(name)
+    if codec is None:
+        raise ValueError(f"Codec '{name}' is not available (installed: {', '.join(_AVAILABLE)})")
+    return codec
+
+
+def decode(payload: Payload) -> Dict[str, Any]:
+    """
+    Decode a payload produced by any codec.
+
+    Raises:
+        CodecError: If the payload is malformed or its codec is not installed
+    """
+    try:
+        if isinstance(payload, bytes) and payload[:1] == MSGPACK_HEADER:
+            if msgpack is None:
+                raise CodecError("Received a msgpack payload but msgpack is not installed")
+            return _AVAILABLE['msgpack'].decode(payload)
+        return _JSON_DECODER.decode(payload)
+    except CodecError:
+        raise
+    except Exception as e:
+        raise CodecError(f"Failed to decode event payload: {e}") from e
@@ -1,8 +1,94 @@
-from db import fetch_profiles, fetch_profile_by_id, insert_profile, update_profile, delete_profile
-from .event_publisher import get_publisher
+import threading
 
-# This file can be used to define higher-level CRUD operations or business logic if needed.
-# For now, it directly imports and uses the database functions from db.py.
+from . import db
+from .db import fetch_profiles, fetch_profile_by_id, fetch_active_profile
+from .events import PROFILE_TOPIC, build_profile_event
+from .outbox import Outbox
 
-# Initialize publisher
-publisher = get_publisher()
\ No newline at end of file
+# Profile CRUD with change events (transactional outbox).
+#
+# Each mutation writes the profile row and its profile_events record to the
+# event_outbox table in the same SQLite transaction, so an event exists if and
+# only if the change committed. Nothing here talks to Redis: a relay
+# (outbox_relay.py, or any EventPublisher draining the same outbox) streams
+# committed events to Redis in batches.
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox():
+    """The outbox shared by the CRUD operations (created on first use)."""
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                _outbox = Outbox()
+    return _outbox
+
+
+def _profile_data(active, dll_path, token_name):
+    return {'active': bool(active), 'dll_path': dll_path, 'token_name': token_name}
+
+
+def _updated_event(profile_id):
+    """profile_updated event carrying a row as it now stands (inside the transaction)."""
+    profile = db.fetch_profile_by_id(profile_id)
+    return (PROFILE_TOPIC, build_profile_event('profile_updated', profile[0], _profile_data(*profile[1:4])))
+
+
+def insert_profile(active, dll_path, token_name):
+    outbox = get_outbox()
+    with db.transaction() as conn:
+        # An active insert clears the current active profile; publish that
+        # too, or other processes' caches end up with two active rows.
+        previous = db.fetch_active_profile() if active else None
+        profile_id = db.insert_profile(active, dll_path, token_name)
+        events = []
+        if previous is not None:
+            events.append((PROFILE_TOPIC, build_profile_event(
+                'profile_updated', previous[0], _profile_data(0, previous[2], previous[3]))))
+        events.append((PROFILE_TOPIC, build_profile_event(
+            'profile_created', profile_id, _profile_data(active, dll_path, token_name))))
+        outbox.append_many(events, conn=conn)
+    outbox.notify()
+    return profile_id
+
+
+def update_profile(profile_id, active, dll_path, token_name):
+    outbox = get_outbox()
+    with db.transaction() as conn:
+        previous_id = db.update_profile(profile_id, active, dll_path, token_name)
+        events = []
+        if previous_id is not None:
+            events.append(_updated_event(previous_id))
+        events.append((PROFILE_TOPIC, build_profile_event(
+            'profile_updated', int(profile_id), _profile_data(active, dll_path, token_name))))
+        outbox.append_many(events, conn=conn)
+    outbox.notify()
+
+
+def set_active_profile(profile_id):
+    outbox = get_outbox()
+    with db.transaction() as conn:
+        profile = db.fetch_profile_by_id(profile_id)
+        previous_id = db.set_active_profile(profile_id)
+        # Publish only rows that changed: none if the profile was already
+        # active (or does not exist).
+        if profile is None or int(profile[1]):
+            return previous_id
+        events = []
+        if previous_id is not None:
+            events.append(_updated_event(previous_id))
+        events.append(_updated_event(profile[0]))
+        outbox.append_many(events, conn=conn)
+    outbox.notify()
+    return previous_id
+
+
+def delete_profile(profile_id):
+    outbox = get_outbox()
+    with db.transaction() as conn:
+        db.delete_profile(profile_id)
+        outbox.append(PROFILE_TOPIC, build_profile_event('profile_deleted', int(profile_id)), conn=conn)
+    outbox.notify()
@@ -0,0 +1,221 @@
+"""
+Executors used by EventSubscriber to run event handlers.
+"""
+import collections
+import logging
+import threading
+import zlib
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+# Backpressure policies applied when the pending-work queue is full.
+OVERFLOW_BLOCK = 'block'              # wait for room (slows the Redis reader down)
+OVERFLOW_DROP_OLDEST = 'drop_oldest'  # evict the oldest queued event
+OVERFLOW_REJECT = 'reject'            # refuse the new event
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_REJECT)
+
+
+class BoundedWorkerPool:
+    """
+    Fixed-size worker pool fed by a bounded queue.
+
+    Unlike starting a thread per event, the thread count and the memory held
+    by pending work are both capped; what happens when the queue is full is
+    decided by an explicit overflow policy.
+    """
+
+    def __init__(self, max_workers: int = 8, max_queue_size: int = 1000,
+                 overflow_policy: str = OVERFLOW_BLOCK, name: str = 'event-worker'):
+        """
+        Initialize and start the worker pool.
+
+        Args:
+            max_workers: Number of worker threads (default: 8)
+            max_queue_size: Maximum number of queued tasks (default: 1000)
+            overflow_policy: 'block', 'drop_oldest' or 'reject' (default: 'block')
+            name: Prefix for worker thread names
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        if max_workers < 1 or max_queue_size < 1:
+            raise ValueError("max_workers and max_queue_size must be positive")
+
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+
+        self._queue = collections.deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._running = True
+        self._counters = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'dropped': 0,
+            'max_queue_depth': 0,
+        }
+
+        self._workers = []
+        for i in range(max_workers):
+            worker = threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, fn: Callable, *args: Any) -> bool:
+        """
+        Queue fn(*args) for execution.
+
+        Returns:
+            bool: True if the task was queued, False if it was rejected
+        """
+        with self._lock:
+            if not self._running:
+                self._counters['rejected'] += 1
+                return False
+
+            if len(self._queue) >= self.max_queue_size:
+                if self.overflow_policy == OVERFLOW_REJECT:
+                    self._counters['rejected'] += 1
+                    return False
+                if self.overflow_policy == OVERFLOW_DROP_OLDEST:
+                    self._queue.popleft()
+                    self._counters['dropped'] += 1
+                else:
+                    while self._running and len(self._queue) >= self.max_queue_size:
+                        self._not_full.wait()
+                    if not self._running:
+                        self._counters['rejected'] += 1
+                        return False
+
+            self._queue.append((fn, args))
+            self._counters['submitted'] += 1
+            depth = len(self._queue)
+            if depth > self._counters['max_queue_depth']:
+                self._counters['max_queue_depth'] = depth
+            self._not_empty.notify()
+            return True
+
+    def _work(self):
+        while True:
+            with self._lock:
+                while self._running and not self._queue:
+                    self._not_empty.wait()
+                if not self._queue:
+                    return
+                fn, args = self._queue.popleft()
+                # Wake a producer blocked on a full queue.
+                self._not_full.notify()
+
+            try:
+                fn(*args)
+                outcome = 'completed'
+            except Exception as e:
+                logger.error(f"Error in worker task: {e}", exc_info=True)
+                outcome = 'failed'
+
+            with self._lock:
+                self._counters[outcome] += 1
+
+    def queue_depth(self) -> int:
+        """Number of tasks waiting for a worker."""
+        with self._lock:
+            return len(self._queue)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get pool counters, including the current queue depth."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['queue_depth'] = len(self._queue)
+        stats['workers'] = self.max_workers
+        return stats
+
+    def shutdown(self, wait: bool = True, timeout: float = 5.0):
+        """
+        Stop accepting work. Already queued tasks are still run.
+
+        Args:
+            wait: Join the worker threads before returning
+            timeout: Per-worker join timeout in seconds
+        """
+        with self._lock:
+            self._running = False
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        if wait:
+            for worker in self._workers:
+                if worker is not threading.current_thread():
+                    worker.join(timeout=timeout)
+
+
+class KeyedDispatcher:
+    """
+    Runs tasks on serial lanes chosen by a key.
+
+    Tasks that share a key always land on the same lane and run in submission
+    order; different keys are spread across lanes and run in parallel. Each
+    lane is a single-worker BoundedWorkerPool, so queue bounds and overflow
+    policies behave exactly as in 'pool' mode (per lane).
+    """
+
+    def __init__(self, lanes: int = 8, max_queue_size: int = 1000,
+                 overflow_policy: str = OVERFLOW_BLOCK, name: str = 'event-lane'):
+        """
+        Initialize and start the lanes.
+
+        Args:
+            lanes: Number of serial lanes / worker threads (default: 8)
+            max_queue_size: Maximum queued tasks per lane (default: 1000)
+            overflow_policy: 'block', 'drop_oldest' or 'reject' (default: 'block')
+            name: Prefix for lane thread names
+        """
+        if lanes < 1:
+            raise ValueError("lanes must be positive")
+        self.max_workers = lanes
+        self._lanes = [
+            BoundedWorkerPool(max_workers=1, max_queue_size=max_queue_size,
+                              overflow_policy=overflow_policy, name=f"{name}-{i}")
+            for i in range(lanes)
+        ]
+        self._next_unkeyed = 0
+
+    def lane_for(self, key: Any) -> int:
+        """Return the lane index a key is pinned to."""
+        if key is None:
+            # Unkeyed events carry no ordering constraint; round-robin them.
+            lane = self._next_unkeyed
+            self._next_unkeyed = (lane + 1) % len(self._lanes)
+            return lane
+        return zlib.crc32(str(key).encode('utf-8')) % len(self._lanes)
+
+    def submit(self, key: Any, fn: Callable, *args: Any) -> bool:
+        """
+        Queue fn(*args) on the lane for key.
+
+        Returns:
+            bool: True if the task was queued, False if it was rejected
+        """
+        return self._lanes[self.lane_for(key)].submit(fn, *args)
+
+    def queue_depth(self) -> int:
+        """Number of tasks waiting across all lanes."""
+        return sum(lane.queue_depth() for lane in self._lanes)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get counters summed across lanes, plus the deepest lane."""
+        lane_stats = [lane.get_stats() for lane in self._lanes]
+        totals = collections.Counter()
+        for stats in lane_stats:
+            totals.update(stats)
+        totals['workers'] = len(self._lanes)
+        totals['max_queue_depth'] = max(stats['max_queue_depth'] for stats in lane_stats)
+        totals['deepest_lane'] = max(stats['queue_depth'] for stats in lane_stats)
+        return dict(totals)
+
+    def shutdown(self, wait: bool = True, timeout: float = 5.0):
+        """Stop accepting work on every lane. Already queued tasks are still run."""
+        for lane in self._lanes:
+            lane.shutdown(wait=wait, timeout=timeout)
@@ -1,18 +1,53 @@
 import redis
-import json
 import logging
-from typing import Dict, Any, Optional
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from .codec import get_codec
+from .events import PROFILE_TOPIC, build_profile_event
+from .outbox import Outbox, OutboxDrainer
+from .streams import DEFAULT_MAXLEN, PAYLOAD_FIELD, configured_stream_topics, stream_key
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 'redis' publishes and reports failures, 'buffer' holds events in memory
+# while Redis is unreachable and sends them once it is back, 'disabled'
+# drops every event without touching the network.
+PUBLISHER_MODES = ('redis', 'buffer', 'disabled')
+PUBLISHER_MODE_ENV = 'EVENT_PUBLISHER_MODE'
+
+DEFAULT_SOCKET_TIMEOUT = 5.0
+DEFAULT_CONNECT_TIMEOUT = 2.0
+# After a connection failure, publishes fail (or buffer) immediately for
+# this many seconds instead of each waiting out the connect timeout.
+RETRY_INTERVAL = 5.0
+
+
+def configured_publisher_mode() -> str:
+    """The mode named by EVENT_PUBLISHER_MODE (default: 'redis')."""
+    mode = os.environ.get(PUBLISHER_MODE_ENV, '').strip().lower() or 'redis'
+    if mode not in PUBLISHER_MODES:
+        raise ValueError(f"{PUBLISHER_MODE_ENV} must be one of {', '.join(PUBLISHER_MODES)}, not {mode!r}")
+    return mode
+
 
 class EventPublisher:
     """
     Event publisher that publishes events to Redis topics.
     """
     
-    def __init__(self, host='localhost', port=6379, db=0):
+    def __init__(self, host='localhost', port=6379, db=0, codec='json',
+                 stream_topics: Optional[Iterable[str]] = None, stream_maxlen: int = DEFAULT_MAXLEN,
+                 outbox: Optional[Outbox] = None, mode: str = 'redis', lazy: bool = False,
+                 socket_timeout: Optional[float] = DEFAULT_SOCKET_TIMEOUT,
+                 socket_connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+                 max_connections: Optional[int] = None, buffer_size: int = 10000):
         """
         Initialize the Redis event publisher.
         
@@ -20,44 +55,263 @@ class EventPublisher:
             host: Redis host (default: localhost)
             port: Redis port (default: 6379)
             db: Redis database number (default: 0)
+            codec: Payload codec: 'json' (default), 'orjson', 'msgpack' or
+                'auto' (see services.codec)
+            stream_topics: Topics published to Redis Streams instead of
+                pub/sub (default: EVENT_STREAM_TOPICS, see services.streams)
+            stream_maxlen: Approximate number of entries kept per stream
+                (default: 10000)
+            outbox: When given, publish() and publish_many() append to this
+                durable outbox and a background drainer forwards entries to
+                Redis; a Redis outage at startup is then not fatal
+            mode: 'redis' (default), 'buffer' or 'disabled' (see
+                PUBLISHER_MODES)
+            lazy: Don't connect until the first publish; otherwise ping Redis
+                now and raise if it is unreachable (unless an outbox is given)
+            socket_timeout: Seconds a Redis command may block (default: 5)
+            socket_connect_timeout: Seconds a connection attempt may block
+                (default: 2)
+            max_connections: Connection pool limit (default: unlimited)
+            buffer_size: Events held in 'buffer' mode before the oldest are
+                dropped (default: 10000)
         """
+        if mode not in PUBLISHER_MODES:
+            raise ValueError(f"Unknown publisher mode: {mode}")
+        self.codec = get_codec(codec)
+        self.stream_topics = set(stream_topics) if stream_topics is not None else configured_stream_topics()
+        self.stream_maxlen = stream_maxlen
+        self.outbox = outbox
+        self.mode = mode
+        self.drainer = None
+        self.pool = None
+        self.redis_client = None
+        self._lock = threading.Lock()
+        self._buffer = deque(maxlen=buffer_size)  # (topic, payload), 'buffer' mode only
+        self._dropped = 0
+        self._retry_at = 0.0  # monotonic time before which Redis is not tried
+        
+        if mode == 'disabled':
+            logger.info("Event publishing disabled")
+            return
+        
+        # Creating the pool and client does not connect; the first command does.
+        self.pool = redis.ConnectionPool(
+            host=host, port=port, db=db, decode_responses=True,
+            socket_timeout=socket_timeout, socket_connect_timeout=socket_connect_timeout,
+            max_connections=max_connections,
+        )
+        self.redis_client = redis.Redis(connection_pool=self.pool)
+        if not lazy:
+            try:
+                # Test connection
+                self.redis_client.ping()
+                logger.info(f"Connected to Redis at {host}:{port}")
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                if outbox is None:
+                    logger.error(f"Failed to connect to Redis: {e}")
+                    raise
+                logger.warning(f"Redis unavailable, events will wait in the outbox: {e}")
+        
+        if outbox is not None:
+            self.drainer = OutboxDrainer(outbox, lambda events: self.publish_many(events, direct=True))
+            self.drainer.start()
+    
+    def ping(self) -> bool:
+        """
+        Check that Redis is reachable.
+        
+        Returns:
+            bool: True if Redis answered (always False in 'disabled' mode)
+        """
+        if self.redis_client is None:
+            return False
         try:
-            self.redis_client = redis.Redis(host=host, port=port, db=db, decode_responses=True)
-            # Test connection
             self.redis_client.ping()
-            logger.info(f"Connected to Redis at {host}:{port}")
-        except redis.ConnectionError as e:
-            logger.error(f"Failed to connect to Redis: {e}")
-            raise
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            logger.debug(f"Redis ping failed: {e}")
+            return False
+        self._retry_at = 0.0
+        return True
     
-    def publish(self, topic: str, event: Dict[str, Any]) -> bool:
+    def publish(self, topic: str, event: Dict[str, Any], direct: bool = False) -> bool:
         """
         Publish an event to a Redis topic.
         
         Args:
             topic: The topic/channel to publish to
             event: Dictionary containing event data
+            direct: Send to Redis now even when an outbox is configured
             
         Returns:
-            bool: True if published successfully, False otherwise
+            bool: True if published (or durably queued in the outbox)
+            successfully, False otherwise
         """
+        if self.mode == 'disabled':
+            return False
+        if self.outbox is not None and not direct:
+            try:
+                self.outbox.append(topic, event)
+                return True
+            except Exception as e:
+                logger.error(f"Failed to write event for topic '{topic}' to the outbox: {e}")
+                return False
+        
         try:
-            # Add timestamp to event
-            event_with_timestamp = {
-                **event,
-                'timestamp': event.get('timestamp', self._get_current_timestamp())
-            }
-            
-            # Serialize event to JSON
-            event_json = json.dumps(event_with_timestamp)
-            
-            # Publish to Redis
-            result = self.redis_client.publish(topic, event_json)
-            logger.info(f"Published event to topic '{topic}': {event_with_timestamp.get('event_type', 'unknown')}")
-            return True
+            event_json = self._serialize(event)
         except Exception as e:
             logger.error(f"Failed to publish event to topic '{topic}': {e}")
             return False
+        
+        # Publish to Redis
+        ok = self._deliver([(topic, event_json)])[0]
+        if ok:
+            logger.debug(f"Published event to topic '{topic}': {event.get('event_type', 'unknown')}")
+        return ok
+    
+    def publish_many(self, events: Iterable[Tuple[str, Dict[str, Any]]], direct: bool = False) -> List[bool]:
+        """
+        Publish several events in a single round-trip using a Redis pipeline.
+        
+        Args:
+            events: Iterable of (topic, event) pairs
+            direct: Send to Redis now even when an outbox is configured
+            
+        Returns:
+            List[bool]: Per-event result, in the same order as the input
+        """
+        if self.mode == 'disabled':
+            return [False for _ in events]
+        if self.outbox is not None and not direct:
+            events = list(events)
+            try:
+                self.outbox.append_many(events)
+                return [True] * len(events)
+            except Exception as e:
+                logger.error(f"Failed to write {len(events)} events to the outbox: {e}")
+                return [False] * len(events)
+        
+        payloads = []
+        results = []
+        for topic, event in events:
+            try:
+                payloads.append((topic, self._serialize(event)))
+                results.append(True)
+            except Exception as e:
+                logger.error(f"Failed to serialize event for topic '{topic}': {e}")
+                results.append(False)
+        
+        if not payloads:
+            return results
+        
+        sent = iter(self._deliver(payloads))
+        for i, ok in enumerate(results):
+            if ok:
+                results[i] = next(sent)
+        logger.debug(f"Published batch: {results.count(True)}/{len(results)} events")
+        return results
+    
+    def _deliver(self, payloads: List[Tuple[str, bytes]]) -> List[bool]:
+        """
+        Send serialized (topic, payload) pairs in one round trip.
+        
+        In 'buffer' mode, events buffered during an outage go out first, and
+        events that cannot be sent are buffered (and reported as sent).
+        """
+        buffering = self.mode == 'buffer'
+        if time.monotonic() < self._retry_at:
+            # Redis failed recently; don't wait out another timeout.
+            if buffering:
+                self._buffer_payloads(payloads)
+                return [True] * len(payloads)
+            return [False] * len(payloads)
+        
+        backlog = self._take_buffer() if buffering else []
+        batch = backlog + payloads
+        try:
+            if len(batch) == 1:
+                # A lone event needs no pipeline.
+                self._send(self.redis_client, *batch[0])
+                replies = [None]
+            else:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for topic, payload in batch:
+                    self._send(pipe, topic, payload)
+                replies = pipe.execute(raise_on_error=False)
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            self._retry_at = time.monotonic() + RETRY_INTERVAL
+            if buffering:
+                self._buffer_payloads(batch)
+                logger.warning(f"Redis unavailable, buffering events: {e}")
+                return [True] * len(payloads)
+            logger.error(f"Failed to publish batch of {len(payloads)} events: {e}")
+            return [False] * len(payloads)
+        except Exception as e:
+            logger.error(f"Failed to publish batch of {len(payloads)} events: {e}")
+            return [False] * len(payloads)
+        
+        if backlog:
+            failed = sum(isinstance(reply, Exception) for reply in replies[:len(backlog)])
+            logger.info(f"Sent {len(backlog) - failed} buffered events ({failed} rejected)")
+        return [not isinstance(reply, Exception) for reply in replies[len(backlog):]]
+    
+    def _buffer_payloads(self, payloads: List[Tuple[str, bytes]]):
+        with self._lock:
+            self._dropped += max(0, len(self._buffer) + len(payloads) - self._buffer.maxlen)
+            self._buffer.extend(payloads)
+    
+    def _take_buffer(self) -> List[Tuple[str, bytes]]:
+        with self._lock:
+            backlog = list(self._buffer)
+            self._buffer.clear()
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            logger.warning(f"{dropped} buffered events dropped while Redis was unavailable")
+        return backlog
+    
+    @contextmanager
+    def batch(self) -> Iterator['PublishBatch']:
+        """
+        Collect publishes and send them as one pipeline when the block exits.
+        
+        Usage:
+            with publisher.batch() as batch:
+                batch.publish('profile_events', event)
+            batch.results  # per-event bools
+        """
+        publish_batch = PublishBatch(self)
+        yield publish_batch
+        publish_batch.flush()
+    
+    def set_topic_transport(self, topic: str, transport: str):
+        """
+        Choose how a topic is published.
+        
+        Args:
+            topic: The topic/channel name
+            transport: 'pubsub' (default for every topic) or 'stream'
+        """
+        if transport == 'stream':
+            self.stream_topics.add(topic)
+        elif transport == 'pubsub':
+            self.stream_topics.discard(topic)
+        else:
+            raise ValueError(f"Unknown transport: {transport}")
+    
+    def _send(self, client, topic: str, payload: bytes):
+        """Issue the publish command for a topic's transport on a client or pipeline."""
+        if topic in self.stream_topics:
+            client.xadd(stream_key(topic), {PAYLOAD_FIELD: payload},
+                        maxlen=self.stream_maxlen, approximate=True)
+        else:
+            client.publish(topic, payload)
+    
+    def _serialize(self, event: Dict[str, Any]) -> bytes:
+        """Add a timestamp (unless present) and encode the event with the configured codec."""
+        event_with_timestamp = {
+            **event,
+            'timestamp': event.get('timestamp', self._get_current_timestamp())
+        }
+        return self.codec.encode(event_with_timestamp)
     
     def publish_key_submitted(self, key_value: str, token_name: str, user_id: Optional[str] = None):
         """
@@ -84,12 +338,7 @@ class EventPublisher:
             profile_id: The created profile ID
             profile_data: Profile data
         """
-        event = {
-            'event_type': 'profile_created',
-            'profile_id': profile_id,
-            'profile_data': profile_data
-        }
-        return self.publish('profile_events', event)
+        return self.publish(PROFILE_TOPIC, build_profile_event('profile_created', profile_id, profile_data))
     
     def publish_profile_updated(self, profile_id: int, profile_data: Dict[str, Any]):
         """
@@ -99,12 +348,7 @@ class EventPublisher:
             profile_id: The updated profile ID
             profile_data: Updated profile data
         """
-        event = {
-            'event_type': 'profile_updated',
-            'profile_id': profile_id,
-            'profile_data': profile_data
-        }
-        return self.publish('profile_events', event)
+        return self.publish(PROFILE_TOPIC, build_profile_event('profile_updated', profile_id, profile_data))
     
     def publish_profile_deleted(self, profile_id: int):
         """
@@ -113,11 +357,7 @@ class EventPublisher:
         Args:
             profile_id: The deleted profile ID
         """
-        event = {
-            'event_type': 'profile_deleted',
-            'profile_id': profile_id
-        }
-        return self.publish('profile_events', event)
+        return self.publish(PROFILE_TOPIC, build_profile_event('profile_deleted', profile_id))
     
     def _get_current_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
@@ -126,28 +366,147 @@ class EventPublisher:
     
     def close(self):
         """Close the Redis connection."""
-        if hasattr(self, 'redis_client'):
+        if self.drainer is not None:
+            self.drainer.stop()
+        if self._buffer:
+            logger.warning(f"{len(self._buffer)} buffered events were never sent")
+        if self.redis_client is not None:
             self.redis_client.close()
+            self.pool.disconnect()
             logger.info("Redis connection closed")
 
 
+class PublishBatch:
+    """Events collected by EventPublisher.batch(), sent together on flush."""
+    
+    def __init__(self, publisher: EventPublisher):
+        self.publisher = publisher
+        self.pending: List[Tuple[str, Dict[str, Any]]] = []
+        self.results: List[bool] = []
+    
+    def publish(self, topic: str, event: Dict[str, Any]) -> int:
+        """
+        Queue an event.
+        
+        Returns:
+            int: Index of this event's entry in `results` after flushing
+        """
+        self.pending.append((topic, event))
+        return len(self.results) + len(self.pending) - 1
+    
+    def flush(self) -> List[bool]:
+        """Send queued events and return their results."""
+        if self.pending:
+            pending, self.pending = self.pending, []
+            self.results.extend(self.publisher.publish_many(pending))
+        return self.results
+
+
+class BatchingPublisher:
+    """
+    Background flusher that coalesces publishes into pipelined batches.
+    
+    A batch is sent once it holds `max_items` events or its oldest event has
+    waited `max_delay_ms`, whichever comes first. Each publish returns a
+    Future that resolves to that event's bool result.
+    """
+    
+    def __init__(self, publisher: EventPublisher, max_items: int = 100, max_delay_ms: float = 5.0):
+        """
+        Initialize and start the flusher thread.
+        
+        Args:
+            publisher: EventPublisher used to send batches
+            max_items: Flush once this many events are pending (default: 100)
+            max_delay_ms: Maximum time an event waits before flushing (default: 5 ms)
+        """
+        self.publisher = publisher
+        self.max_items = max_items
+        self.max_delay = max_delay_ms / 1000.0
+        self._pending: List[Tuple[str, Dict[str, Any], Future]] = []
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='event-publisher-flusher', daemon=True)
+        self._thread.start()
+    
+    def publish(self, topic: str, event: Dict[str, Any]) -> Future:
+        """Queue an event; the returned Future resolves to True/False once sent."""
+        future = Future()
+        with self._cond:
+            if not self._running:
+                future.set_result(False)
+                return future
+            self._pending.append((topic, event, future))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_items:
+                self._cond.notify()
+        return future
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = time.monotonic() + self.max_delay
+                while self._running and len(self._pending) < self.max_items:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.max_items]
+                del self._pending[:self.max_items]
+            self._send(batch)
+    
+    def _send(self, batch: List[Tuple[str, Dict[str, Any], Future]]):
+        try:
+            results = self.publisher.publish_many((topic, event) for topic, event, _ in batch)
+        except Exception as e:
+            logger.error(f"Failed to flush event batch: {e}")
+            results = [False] * len(batch)
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+    
+    def close(self, timeout: float = 5.0):
+        """Flush everything still pending and stop the flusher thread."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
+
+
 # Singleton instance
 _publisher_instance = None
+_publisher_lock = threading.Lock()
 
-def get_publisher(host='localhost', port=6379, db=0) -> EventPublisher:
+def get_publisher(host='localhost', port=6379, db=0, use_outbox=False,
+                  mode: Optional[str] = None) -> EventPublisher:
     """
     Get or create a singleton EventPublisher instance.
     
+    The publisher connects lazily: getting it never touches the network, and
+    an unreachable Redis only shows up as failed (or buffered) publishes.
+    The arguments are only honoured when the singleton is first created.
+    
     Args:
         host: Redis host
         port: Redis port
         db: Redis database number
+        use_outbox: Route publishes through the durable outbox in profiles.db
+        mode: 'redis', 'buffer' or 'disabled' (default: EVENT_PUBLISHER_MODE,
+            else 'redis')
         
     Returns:
         EventPublisher instance
     """
     global _publisher_instance
-    if _publisher_instance is None:
-        _publisher_instance = EventPublisher(host=host, port=port, db=db)
-    return _publisher_instance
+    publisher = _publisher_instance
+    if publisher is None:
+        with _publisher_lock:
+            if _publisher_instance is None:
+                outbox = Outbox() if use_outbox else None
+                _publisher_instance = EventPublisher(host=host, port=port, db=db, outbox=outbox,
+                                                     mode=mode or configured_publisher_mode(), lazy=True)
+            publisher = _publisher_instance
+    return publisher
 
@@ -1,8 +1,19 @@
 import redis
-import json
 import logging
 import threading
-from typing import Callable, Dict, Any, List
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
+
+from . import codec
+from .metrics import MetricsRegistry
+from .dispatch import BoundedWorkerPool, KeyedDispatcher, OVERFLOW_BLOCK
+from .streams import DEFAULT_GROUP, StreamConsumer, configured_stream_topics
+
+# Event fields used to pick a serial lane in 'keyed' dispatch mode; the first
+# one present in the event wins.
+DEFAULT_ORDERING_KEYS = ('profile_id', 'token_name')
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,7 +24,14 @@ class EventSubscriber:
     Event subscriber that subscribes to Redis topics and processes events.
     """
     
-    def __init__(self, host='localhost', port=6379, db=0):
+    def __init__(self, host='localhost', port=6379, db=0, dispatch_mode='thread',
+                 max_workers=8, max_queue_size=1000, overflow_policy=OVERFLOW_BLOCK,
+                 ordering_keys: Sequence[str] = DEFAULT_ORDERING_KEYS,
+                 key_func: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+                 stream_topics: Optional[Sequence[str]] = None,
+                 consumer_group: str = DEFAULT_GROUP, consumer_name: Optional[str] = None,
+                 partition: Optional[Tuple[int, int]] = None,
+                 observers: Optional[Dict[str, Callable[[str, Dict[str, Any]], None]]] = None):
         """
         Initialize the Redis event subscriber.
         
@@ -21,9 +39,62 @@ class EventSubscriber:
             host: Redis host (default: localhost)
             port: Redis port (default: 6379)
             db: Redis database number (default: 0)
+            dispatch_mode: 'thread' starts one thread per event (default);
+                'pool' runs handlers on a fixed-size worker pool;
+                'keyed' runs events sharing a key in order on one serial lane
+            max_workers: Worker threads (or lanes) in 'pool'/'keyed' mode (default: 8)
+            max_queue_size: Pending events allowed in 'pool' mode, or per
+                lane in 'keyed' mode (default: 1000)
+            overflow_policy: What happens when the queue is full:
+                'block', 'drop_oldest' or 'reject' (default: 'block')
+            ordering_keys: Event fields tried in order to build the 'keyed'
+                mode key (default: profile_id, then token_name)
+            key_func: Optional callable (topic, event_data) -> key that
+                overrides ordering_keys
+            stream_topics: Topics consumed from Redis Streams through a
+                consumer group instead of pub/sub (default:
+                EVENT_STREAM_TOPICS, see services.streams)
+            consumer_group: Consumer group shared by processor instances
+            consumer_name: This instance's consumer name (default: host-pid)
+            partition: (index, count) when this is one of `count` processes
+                sharing pub/sub topics; only events whose ordering key hashes
+                to `index` are handled here (stream topics are shared through
+                the consumer group instead)
+            observers: Optional topic -> callable run inline in the listener
+                thread for every event received on that topic, before
+                partition filtering; for cheap per-process bookkeeping such
+                as cache invalidation that every process needs
         """
+        if dispatch_mode not in ('thread', 'pool', 'keyed'):
+            raise ValueError(f"Unknown dispatch mode: {dispatch_mode}")
+        self.dispatch_mode = dispatch_mode
+        self.ordering_keys = tuple(ordering_keys)
+        self.key_func = key_func
+        self.stream_topics = set(stream_topics) if stream_topics is not None else configured_stream_topics()
+        self.consumer_group = consumer_group
+        self.consumer_name = consumer_name
+        self.stream_consumer = None
+        self.partition = partition
+        self.observers = dict(observers or {})
+        self.worker_pool = None
+        if dispatch_mode == 'keyed':
+            self.worker_pool = KeyedDispatcher(
+                lanes=max_workers,
+                max_queue_size=max_queue_size,
+                overflow_policy=overflow_policy,
+                name='event-subscriber-lane'
+            )
+        elif dispatch_mode == 'pool':
+            self.worker_pool = BoundedWorkerPool(
+                max_workers=max_workers,
+                max_queue_size=max_queue_size,
+                overflow_policy=overflow_policy,
+                name='event-subscriber-worker'
+            )
+
         try:
-            self.redis_client = redis.Redis(host=host, port=port, db=db, decode_responses=True)
+            # Raw bytes: payloads may come from a binary codec (see services.codec)
+            self.redis_client = redis.Redis(host=host, port=port, db=db, decode_responses=False)
             self.pubsub = self.redis_client.pubsub()
             # Test connection
             self.redis_client.ping()
@@ -42,14 +113,16 @@ class EventSubscriber:
             topics: List of topics to subscribe to
             handler: Callback function that receives (topic, event_data)
         """
-        for topic in topics:
+        pubsub_topics = self._start_stream_consumer({topic: handler for topic in topics})
+        for topic in pubsub_topics:
             self.pubsub.subscribe(topic)
             logger.info(f"Subscribed to topic: {topic}")
         
         self.event_handler = handler
         self.running = True
-        self.subscription_thread = threading.Thread(target=self._listen_for_events, daemon=True)
-        self.subscription_thread.start()
+        if pubsub_topics:
+            self.subscription_thread = threading.Thread(target=self._listen_for_events, daemon=True)
+            self.subscription_thread.start()
         logger.info("Event listener started")
     
     def subscribe_to_topics(self, topic_handlers: Dict[str, Callable[[str, Dict[str, Any]], None]]):
@@ -59,16 +132,45 @@ class EventSubscriber:
         Args:
             topic_handlers: Dictionary mapping topic names to handler functions
         """
-        for topic in topic_handlers.keys():
+        pubsub_topics = self._start_stream_consumer(topic_handlers)
+        for topic in pubsub_topics:
             self.pubsub.subscribe(topic)
             logger.info(f"Subscribed to topic: {topic}")
         
         self.topic_handlers = topic_handlers
         self.running = True
-        self.subscription_thread = threading.Thread(target=self._listen_for_events_multiple_handlers, daemon=True)
-        self.subscription_thread.start()
+        if pubsub_topics:
+            self.subscription_thread = threading.Thread(target=self._listen_for_events_multiple_handlers, daemon=True)
+            self.subscription_thread.start()
         logger.info("Event listener started with multiple handlers")
     
+    def _start_stream_consumer(self, topic_handlers: Dict[str, Callable[[str, Dict[str, Any]], None]]) -> List[str]:
+        """
+        Start consuming the stream-backed topics among topic_handlers.
+        
+        Returns:
+            List[str]: The remaining topics, to be subscribed via pub/sub
+        """
+        stream_handlers = {t: h for t, h in topic_handlers.items() if t in self.stream_topics}
+        if stream_handlers:
+            def dispatch(topic, event_data, ack):
+                handler = stream_handlers[topic]
+                self._observe(topic, event_data)
+                
+                def handle_and_ack(topic, event_data):
+                    # Raising skips the ack; the entry stays pending and is redelivered.
+                    handler(topic, event_data)
+                    ack()
+                
+                self._dispatch(topic, event_data, handle_and_ack)
+            
+            self.stream_consumer = StreamConsumer(
+                self.redis_client, stream_handlers.keys(), dispatch,
+                group=self.consumer_group, consumer_name=self.consumer_name
+            )
+            self.stream_consumer.start()
+        return [t for t in topic_handlers if t not in self.stream_topics]
+    
     def _listen_for_events(self):
         """Internal method to listen for events and call the handler."""
         try:
@@ -77,20 +179,15 @@ class EventSubscriber:
                     break
                 
                 if message['type'] == 'message':
-                    topic = message['channel']
+                    topic = message['channel'].decode('utf-8')
                     try:
-                        event_data = json.loads(message['data'])
-                        logger.info(f"Received event on topic '{topic}': {event_data.get('event_type', 'unknown')}")
-                        
-                        # Call the handler in a separate thread to avoid blocking
-                        thread = threading.Thread(
-                            target=self._safe_call_handler,
-                            args=(topic, event_data, self.event_handler),
-                            daemon=True
-                        )
-                        thread.start()
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse event JSON: {e}")
+                        event_data = codec.decode(message['data'])
+                        logger.debug(f"Received event on topic '{topic}': {event_data.get('event_type', 'unknown')}")
+                        self._observe(topic, event_data)
+                        if self._in_partition(topic, event_data):
+                            self._dispatch(topic, event_data, self.event_handler)
+                    except codec.CodecError as e:
+                        logger.error(f"Failed to parse event payload: {e}")
                     except Exception as e:
                         logger.error(f"Error processing event: {e}")
         except Exception as e:
@@ -104,29 +201,75 @@ class EventSubscriber:
                     break
                 
                 if message['type'] == 'message':
-                    topic = message['channel']
+                    topic = message['channel'].decode('utf-8')
                     try:
-                        event_data = json.loads(message['data'])
-                        logger.info(f"Received event on topic '{topic}': {event_data.get('event_type', 'unknown')}")
+                        event_data = codec.decode(message['data'])
+                        logger.debug(f"Received event on topic '{topic}': {event_data.get('event_type', 'unknown')}")
+                        self._observe(topic, event_data)
                         
                         # Get the appropriate handler for this topic
                         handler = self.topic_handlers.get(topic)
-                        if handler:
-                            thread = threading.Thread(
-                                target=self._safe_call_handler,
-                                args=(topic, event_data, handler),
-                                daemon=True
-                            )
-                            thread.start()
-                        else:
+                        if not handler:
                             logger.warning(f"No handler registered for topic: {topic}")
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse event JSON: {e}")
+                        elif self._in_partition(topic, event_data):
+                            self._dispatch(topic, event_data, handler)
+                    except codec.CodecError as e:
+                        logger.error(f"Failed to parse event payload: {e}")
                     except Exception as e:
                         logger.error(f"Error processing event: {e}")
         except Exception as e:
             logger.error(f"Error in event listener: {e}")
     
+    def _dispatch(self, topic: str, event_data: Dict[str, Any], handler: Callable):
+        """Hand an event to its handler according to the dispatch mode."""
+        if self.dispatch_mode == 'keyed':
+            key = self._ordering_key(topic, event_data)
+            if not self.worker_pool.submit(key, self._safe_call_handler, topic, event_data, handler):
+                logger.warning(f"Dropped event on topic '{topic}': lane queue full")
+            return
+        if self.worker_pool is not None:
+            if not self.worker_pool.submit(self._safe_call_handler, topic, event_data, handler):
+                logger.warning(f"Dropped event on topic '{topic}': worker queue full")
+            return
+        
+        # Call the handler in a separate thread to avoid blocking
+        thread = threading.Thread(
+            target=self._safe_call_handler,
+            args=(topic, event_data, handler),
+            daemon=True
+        )
+        thread.start()
+    
+    def _ordering_key(self, topic: str, event_data: Dict[str, Any]) -> Any:
+        """Key that pins an event to a serial lane in 'keyed' mode (None = any lane)."""
+        if self.key_func is not None:
+            return self.key_func(topic, event_data)
+        for field in self.ordering_keys:
+            value = event_data.get(field)
+            if value is not None:
+                return f"{field}:{value}"
+        return None
+    
+    def _observe(self, topic: str, event_data: Dict[str, Any]):
+        """Run the topic's observer, if any, on the listener thread."""
+        observer = self.observers.get(topic)
+        if observer is None:
+            return
+        try:
+            observer(topic, event_data)
+        except Exception as e:
+            logger.error(f"Error in observer for topic '{topic}': {e}", exc_info=True)
+    
+    def _in_partition(self, topic: str, event_data: Dict[str, Any]) -> bool:
+        """Whether this process owns a pub/sub event under the partition scheme."""
+        if self.partition is None:
+            return True
+        index, count = self.partition
+        key = self._ordering_key(topic, event_data)
+        if key is None:
+            key = f"{topic}:{event_data.get('event_type')}:{event_data.get('timestamp')}"
+        return zlib.crc32(str(key).encode('utf-8')) % count == index
+    
     def _safe_call_handler(self, topic: str, event_data: Dict[str, Any], handler: Callable):
         """Safely call the handler with error handling."""
         try:
@@ -138,10 +281,26 @@ class EventSubscriber:
         """Stop the event subscriber."""
         self.running = False
         self.pubsub.unsubscribe()
+        if self.stream_consumer is not None:
+            self.stream_consumer.stop()
         if self.subscription_thread and self.subscription_thread.is_alive():
             self.subscription_thread.join(timeout=5)
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
         logger.info("Event subscriber stopped")
     
+    def get_dispatch_stats(self) -> Dict[str, int]:
+        """
+        Get handler dispatch counters.
+        
+        In 'pool' and 'keyed' mode this includes queue_depth, max_queue_depth,
+        submitted, completed, failed, rejected and dropped ('keyed' mode sums
+        them across lanes and adds deepest_lane).
+        """
+        if self.worker_pool is not None:
+            return self.worker_pool.get_stats()
+        return {'queue_depth': 0, 'active_threads': threading.active_count()}
+    
     def close(self):
         """Close the Redis connection."""
         self.stop()
@@ -161,15 +320,46 @@ class EventProcessor:
         
         Args:
             publisher: EventPublisher instance for publishing processed events
+                (an AsyncEventPublisher when using the *_async methods)
             subscriber: EventSubscriber instance for receiving events
+                (or an AsyncEventSubscriber)
         """
         self.publisher = publisher
         self.subscriber = subscriber
-        self.stats = {
-            'keys_processed': 0,
-            'profiles_processed': 0,
-            'events_published': 0
-        }
+        self.metrics = MetricsRegistry()
+        self._keys_processed = self.metrics.counter('keys_processed')
+        self._profiles_processed = self.metrics.counter('profiles_processed')
+        self._events_published = self.metrics.counter('events_published')
+        self._handler_metrics = {}  # (topic, handler name) -> (gauge, histogram, error counter)
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Processing counters (kept for callers of the old dict attribute)."""
+        return self.get_stats()
+    
+    @contextmanager
+    def _track(self, topic: str, handler_name: str):
+        """Record latency, in-flight count and failures of one handler call."""
+        # Registry lookups build and sort label keys; do them once per pair.
+        # Racing threads get the same instruments back, so no lock is needed.
+        instruments = self._handler_metrics.get((topic, handler_name))
+        if instruments is None:
+            instruments = self._handler_metrics[(topic, handler_name)] = (
+                self.metrics.gauge('handlers_in_flight', topic=topic),
+                self.metrics.histogram('handler_latency_seconds', topic=topic, handler=handler_name),
+                self.metrics.counter('handler_errors', topic=topic, handler=handler_name),
+            )
+        in_flight, latency, errors = instruments
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - start)
+            in_flight.dec()
     
     def process_key_submission(self, topic: str, event_data: Dict[str, Any]):
         """
@@ -179,6 +369,29 @@ class EventProcessor:
         """
         logger.info(f"Processing key submission event: {event_data}")
         
+        with self._track(topic, 'process_key_submission'):
+            result_event = self._build_key_result(event_data)
+            self.publisher.publish('processing_results', result_event)
+        self._keys_processed.inc()
+        self._events_published.inc()
+        
+        logger.info(f"Published processing result for key submission")
+    
+    async def process_key_submission_async(self, topic: str, event_data: Dict[str, Any]):
+        """
+        Async variant of process_key_submission for use with AsyncEventSubscriber.
+        
+        Expects `publisher` to be an AsyncEventPublisher.
+        """
+        logger.debug(f"Processing key submission event: {event_data}")
+        
+        with self._track(topic, 'process_key_submission'):
+            result_event = self._build_key_result(event_data)
+            await self.publisher.publish('processing_results', result_event)
+        self._keys_processed.inc()
+        self._events_published.inc()
+    
+    def _build_key_result(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         key_value = event_data.get('key_value', '')
         token_name = event_data.get('token_name', '')
         
@@ -190,17 +403,12 @@ class EventProcessor:
             'processed_at': self._get_current_timestamp()
         }
         
-        # Publish processed result to a different topic
-        result_event = {
+        # Result is published to a different topic
+        return {
             'event_type': 'key_processed',
             'original_event': event_data,
             'result': processed_result
         }
-        self.publisher.publish('processing_results', result_event)
-        self.stats['keys_processed'] += 1
-        self.stats['events_published'] += 1
-        
-        logger.info(f"Published processing result for key submission")
     
     def process_profile_events(self, topic: str, event_data: Dict[str, Any]):
         """
@@ -208,6 +416,29 @@ class EventProcessor:
         """
         logger.info(f"Processing profile event: {event_data}")
         
+        with self._track(topic, 'process_profile_events'):
+            result_event = self._build_profile_result(event_data)
+            self.publisher.publish('processing_results', result_event)
+        self._profiles_processed.inc()
+        self._events_published.inc()
+        
+        logger.info(f"Published processing result for profile event: {result_event['result']['event_type']}")
+    
+    async def process_profile_events_async(self, topic: str, event_data: Dict[str, Any]):
+        """
+        Async variant of process_profile_events for use with AsyncEventSubscriber.
+        
+        Expects `publisher` to be an AsyncEventPublisher.
+        """
+        logger.debug(f"Processing profile event: {event_data}")
+        
+        with self._track(topic, 'process_profile_events'):
+            result_event = self._build_profile_result(event_data)
+            await self.publisher.publish('processing_results', result_event)
+        self._profiles_processed.inc()
+        self._events_published.inc()
+    
+    def _build_profile_result(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         event_type = event_data.get('event_type', '')
         
         # Example processing logic
@@ -217,17 +448,12 @@ class EventProcessor:
             'processed_at': self._get_current_timestamp()
         }
         
-        # Publish processed result to a different topic
-        result_event = {
+        # Result is published to a different topic
+        return {
             'event_type': 'profile_processed',
             'original_event': event_data,
             'result': processed_result
         }
-        self.publisher.publish('processing_results', result_event)
-        self.stats['profiles_processed'] += 1
-        self.stats['events_published'] += 1
-        
-        logger.info(f"Published processing result for profile event: {event_type}")
     
     def _get_current_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
@@ -236,7 +462,18 @@ class EventProcessor:
     
     def get_stats(self) -> Dict[str, int]:
         """Get processing statistics."""
-        return self.stats.copy()
+        return {
+            'keys_processed': self._keys_processed.value,
+            'profiles_processed': self._profiles_processed.value,
+            'events_published': self._events_published.value
+        }
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get every metric, including per-topic/handler latency histograms
+        (count, sum, mean, p50/p95/p99 and bucket counts) and in-flight gauges.
+        """
+        return self.metrics.snapshot()
 
 
 def create_key_processor(publisher: 'EventPublisher') -> Callable:
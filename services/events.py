@@ -0,0 +1,29 @@
+"""
+Profile event payloads.
+
+Kept apart from event_publisher so that code which only writes events to the
+outbox (crud, bulk, the dashboard) does not import redis, which takes longer
+to import than the rest of the dashboard put together.
+"""
+from typing import Any, Dict, Optional
+
+PROFILE_TOPIC = 'profile_events'
+
+
+def build_profile_event(event_type: str, profile_id: int, profile_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build a profile_events payload.
+    
+    Args:
+        event_type: 'profile_created', 'profile_updated', 'profile_deleted'
+            or 'profiles_imported'
+        profile_id: The affected profile ID (None for 'profiles_imported')
+        profile_data: Profile fields (omitted for deletions)
+    """
+    event = {
+        'event_type': event_type,
+        'profile_id': profile_id
+    }
+    if profile_data is not None:
+        event['profile_data'] = profile_data
+    return event
@@ -0,0 +1,182 @@
+"""
+Thread-safe metrics for the event processing hot path.
+
+Counters, gauges and fixed-bucket latency histograms, each guarded by its own
+lock so concurrent handler threads never lose updates and never contend on a
+registry-wide lock. A registry hands out metrics by name and labels and can
+produce a plain-dict snapshot for dashboards or logging.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+# Upper bounds in seconds; the final implicit bucket is +Inf.
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class Counter:
+    """Monotonically increasing count."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Gauge:
+    """Value that can go up and down (queue depth, handlers in flight, ...)."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect plus three additions."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall-clock duration of the with-block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def quantile(self, q: float, counts: Optional[Sequence[int]] = None) -> float:
+        """
+        Estimate a quantile as the upper bound of the bucket containing it.
+
+        Returns the largest finite bound for values in the +Inf bucket and
+        0.0 when nothing has been observed.
+        """
+        counts = counts if counts is not None else list(self._counts)
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[min(index, len(self.buckets) - 1)]
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+            count = self._count
+        return {
+            'count': count,
+            'sum': total_sum,
+            'mean': total_sum / count if count else 0.0,
+            'p50': self.quantile(0.50, counts),
+            'p95': self.quantile(0.95, counts),
+            'p99': self.quantile(0.99, counts),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], counts)),
+        }
+
+
+def _metric_key(name: str, labels: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_key(key: Tuple[str, Tuple[Tuple[str, str], ...]]) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return f"{name}{{{','.join(f'{k}={v}' for k, v in labels)}}}"
+
+
+class MetricsRegistry:
+    """
+    Named, labelled metrics created on first use.
+
+    Look metrics up once and keep the returned object when it is used on a
+    hot path; each lookup sorts the labels.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple, Counter] = {}
+        self._gauges: Dict[Tuple, Gauge] = {}
+        self._histograms: Dict[Tuple, Histogram] = {}
+
+    def _get(self, store: Dict[Tuple, Any], factory, name: str, labels: Dict[str, Any]):
+        key = _metric_key(name, labels)
+        metric = store.get(key)
+        if metric is None:
+            with self._lock:
+                metric = store.get(key)
+                if metric is None:
+                    metric = store[key] = factory()
+        return metric
+
+    def counter(self, name: str, **labels) -> Counter:
+        return self._get(self._counters, Counter, name, labels)
+
+    def gauge(self, name: str, **labels) -> Gauge:
+        return self._get(self._gauges, Gauge, name, labels)
+
+    def histogram(self, name: str, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, **labels) -> Histogram:
+        return self._get(self._histograms, lambda: Histogram(buckets), name, labels)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Point-in-time copy of every metric.
+
+        Returns:
+            Dict with 'counters', 'gauges' and 'histograms', each keyed by
+            'name{label=value,...}'
+        """
+        with self._lock:
+            counters = list(self._counters.items())
+            gauges = list(self._gauges.items())
+            histograms = list(self._histograms.items())
+        return {
+            'counters': {_format_key(k): m.value for k, m in counters},
+            'gauges': {_format_key(k): m.value for k, m in gauges},
+            'histograms': {_format_key(k): m.snapshot() for k, m in histograms},
+        }
@@ -0,0 +1,147 @@
+"""
+Versioned schema migrations for profiles.db.
+
+The schema version lives in SQLite's ``PRAGMA user_version`` header field.
+At startup `migrate()` reads it (one pragma, no table access) and applies any
+migrations with a higher version in order, each in its own transaction
+together with the version bump, so an interrupted upgrade resumes where it
+stopped. Migrations are append-only: never edit one that has shipped; add a
+new one instead.
+"""
+import logging
+import sqlite3
+from typing import Callable, List, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+def _create_profiles(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS profiles (id INTEGER PRIMARY KEY, active BOOLEAN, dll_path TEXT, token_name TEXT)")
+
+
+def _index_profiles(conn):
+    # At most one profile may be active. Older databases could hold several
+    # (insert_profile never cleared the others); keep the one
+    # fetch_active_profile returned, i.e. the lowest id.
+    conn.execute(
+        "UPDATE profiles SET active = 0 WHERE active = 1 "
+        "AND id != (SELECT MIN(id) FROM profiles WHERE active = 1)"
+    )
+    # The partial index holds only the active row, so "WHERE active = 1"
+    # becomes a single index probe and the uniqueness is enforced by SQLite.
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_profiles_single_active ON profiles (active) WHERE active = 1")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_profiles_token_name ON profiles (token_name)")
+
+
+def _create_event_outbox(conn):
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS event_outbox ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "topic TEXT NOT NULL, "
+        "payload BLOB NOT NULL, "
+        "created_at REAL NOT NULL, "
+        "attempts INTEGER NOT NULL DEFAULT 0)"
+    )
+
+
+def _add_profile_metadata(conn):
+    # ALTER TABLE only accepts constant defaults, so existing rows keep NULL
+    # timestamps; new writes fill them in.
+    conn.execute("ALTER TABLE profiles ADD COLUMN created_at TEXT")
+    conn.execute("ALTER TABLE profiles ADD COLUMN updated_at TEXT")
+    conn.execute("ALTER TABLE profiles ADD COLUMN last_used TEXT")
+    conn.execute("ALTER TABLE profiles ADD COLUMN dll_hash TEXT")
+
+
+def _create_profile_search(conn):
+    # External-content FTS5 index: it stores only the index, reading column
+    # values from profiles, and the triggers keep it in step with every write.
+    # Search-as-you-type makes every term a prefix query. Without a prefix
+    # index, a short prefix such as "toke" expands to every distinct term it
+    # starts (one per file name, e.g. token1 ... token99999) and takes over
+    # 100 ms; indexing prefixes up to six characters keeps it under 1 ms at
+    # the cost of a larger index.
+    conn.execute(
+        "CREATE VIRTUAL TABLE profiles_fts USING fts5("
+        "token_name, dll_path, content='profiles', content_rowid='id', prefix='1 2 3 4 5 6')"
+    )
+    conn.execute(
+        "CREATE TRIGGER profiles_fts_insert AFTER INSERT ON profiles BEGIN "
+        "INSERT INTO profiles_fts (rowid, token_name, dll_path) VALUES (new.id, new.token_name, new.dll_path); "
+        "END"
+    )
+    conn.execute(
+        "CREATE TRIGGER profiles_fts_delete AFTER DELETE ON profiles BEGIN "
+        "INSERT INTO profiles_fts (profiles_fts, rowid, token_name, dll_path) "
+        "VALUES ('delete', old.id, old.token_name, old.dll_path); "
+        "END"
+    )
+    # Only text changes touch the index; toggling active does not.
+    conn.execute(
+        "CREATE TRIGGER profiles_fts_update AFTER UPDATE OF token_name, dll_path ON profiles BEGIN "
+        "INSERT INTO profiles_fts (profiles_fts, rowid, token_name, dll_path) "
+        "VALUES ('delete', old.id, old.token_name, old.dll_path); "
+        "INSERT INTO profiles_fts (rowid, token_name, dll_path) VALUES (new.id, new.token_name, new.dll_path); "
+        "END"
+    )
+    conn.execute("INSERT INTO profiles_fts (profiles_fts) VALUES ('rebuild')")
+    # Rank token_name matches well above matches in the path.
+    conn.execute("INSERT INTO profiles_fts (profiles_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "create profiles table", _create_profiles),
+    Migration(2, "single active profile index, token_name index", _index_profiles),
+    Migration(3, "create event_outbox table", _create_event_outbox),
+    Migration(4, "profile timestamps, last_used and dll_hash columns", _add_profile_metadata),
+    Migration(5, "full-text search index over token_name and dll_path", _create_profile_search),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """The version recorded in the database header (0 for a new file)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, migrations: List[Migration] = MIGRATIONS) -> int:
+    """
+    Bring the database up to the latest schema version.
+
+    Args:
+        conn: Connection with no transaction open
+        migrations: Ordered migrations to apply (default: MIGRATIONS)
+
+    Returns:
+        int: The schema version after migrating
+    """
+    version = schema_version(conn)
+    pending = [m for m in migrations if m.version > version]
+    if not pending:
+        return version
+
+    for migration in pending:
+        # IMMEDIATE takes the write lock up front, so when several processes
+        # start at once only one applies each migration; the others see the
+        # bumped version and skip it.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) >= migration.version:
+                conn.rollback()
+                continue
+            migration.apply(conn)
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"Schema migration {migration.version} ({migration.description}) failed")
+            raise
+        logger.info(f"Applied schema migration {migration.version}: {migration.description}")
+    return schema_version(conn)
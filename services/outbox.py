@@ -0,0 +1,204 @@
+"""
+Durable local outbox for events.
+
+Publishing appends the event to the `event_outbox` table in profiles.db (a
+single small WAL commit) and returns immediately. A background drainer
+forwards pending entries to Redis in pipelined batches and deletes them only
+once Redis has accepted them, retrying with backoff while Redis is slow or
+down. Events therefore survive Redis outages and application restarts.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import codec, db
+
+logger = logging.getLogger(__name__)
+
+def _timestamp() -> str:
+    from datetime import datetime
+    return datetime.now().isoformat()
+
+
+class Outbox:
+    """
+    Append-only event log stored beside the profiles table.
+    """
+
+    def __init__(self, get_connection: Callable = db.get_connection):
+        """
+        Initialize the outbox. The event_outbox table is created by the
+        schema migrations (services.db.initialize_db), which must have run.
+
+        Args:
+            get_connection: Returns the calling thread's SQLite connection
+                (default: the shared services.db connection manager)
+        """
+        self.get_connection = get_connection
+        self._codec = codec.get_codec('auto')
+        self._listeners = []
+
+    def add_listener(self, listener: Callable[[], None]):
+        """Register a callable invoked after new entries are committed."""
+        self._listeners.append(listener)
+
+    def notify(self):
+        """Tell listeners (e.g. the drainer) that new entries are waiting."""
+        for listener in self._listeners:
+            listener()
+
+    def _rows(self, events: Iterable[Tuple[str, Dict[str, Any]]]):
+        now = time.time()
+        for topic, event in events:
+            # Stamp the event now so the timestamp reflects when it happened,
+            # not when Redis finally received it.
+            stamped = {**event, 'timestamp': event.get('timestamp') or _timestamp()}
+            yield topic, self._codec.encode(stamped), now
+
+    def append(self, topic: str, event: Dict[str, Any], conn=None) -> None:
+        """
+        Append one event.
+
+        Args:
+            topic: Destination topic
+            event: Event data
+            conn: Write inside this connection's open transaction instead of
+                committing separately; the caller commits and calls notify()
+        """
+        self.append_many([(topic, event)], conn=conn)
+
+    def append_many(self, events: Iterable[Tuple[str, Dict[str, Any]]], conn=None) -> None:
+        """Append several events in one transaction (see `append`)."""
+        sql = "INSERT INTO event_outbox (topic, payload, created_at) VALUES (?, ?, ?)"
+        if conn is not None:
+            conn.executemany(sql, self._rows(events))
+            return
+        conn = self.get_connection()
+        with conn:
+            conn.executemany(sql, self._rows(events))
+        self.notify()
+
+    def fetch_batch(self, limit: int = 100) -> List[Tuple[int, str, Dict[str, Any]]]:
+        """Oldest pending entries as (id, topic, event)."""
+        cursor = self.get_connection().execute(
+            "SELECT id, topic, payload FROM event_outbox ORDER BY id LIMIT ?", (limit,)
+        )
+        batch = []
+        for entry_id, topic, payload in cursor.fetchall():
+            try:
+                batch.append((entry_id, topic, codec.decode(payload)))
+            except codec.CodecError as e:
+                logger.error(f"Discarding unreadable outbox entry {entry_id}: {e}")
+                self.delete([entry_id])
+        return batch
+
+    def delete(self, entry_ids: List[int]):
+        """Remove delivered entries."""
+        if not entry_ids:
+            return
+        conn = self.get_connection()
+        with conn:
+            conn.executemany("DELETE FROM event_outbox WHERE id = ?", [(i,) for i in entry_ids])
+
+    def mark_failed(self, entry_ids: List[int]):
+        """Record a failed delivery attempt."""
+        if not entry_ids:
+            return
+        conn = self.get_connection()
+        with conn:
+            conn.executemany("UPDATE event_outbox SET attempts = attempts + 1 WHERE id = ?", [(i,) for i in entry_ids])
+
+    def pending_count(self) -> int:
+        """Number of entries not yet delivered."""
+        return self.get_connection().execute("SELECT COUNT(*) FROM event_outbox").fetchone()[0]
+
+
+class OutboxDrainer:
+    """
+    Background thread forwarding outbox entries to Redis in batches.
+    """
+
+    def __init__(self, outbox: Outbox, send_batch: Callable[[List[Tuple[str, Dict[str, Any]]]], List[bool]],
+                 batch_size: int = 100, poll_interval: float = 1.0,
+                 retry_delay: float = 0.5, max_retry_delay: float = 30.0):
+        """
+        Initialize the drainer. Call `start()` to begin forwarding.
+
+        Args:
+            outbox: Outbox to drain
+            send_batch: Sends [(topic, event), ...] and returns per-event results
+                (typically EventPublisher.publish_many with direct=True)
+            batch_size: Maximum entries per batch (default: 100)
+            poll_interval: Idle wait between checks for new entries (default: 1 s)
+            retry_delay: Initial delay after a failed batch (default: 0.5 s)
+            max_retry_delay: Upper bound for the doubling retry delay (default: 30 s)
+        """
+        self.outbox = outbox
+        self.send_batch = send_batch
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.delivered = 0
+        self.failed_attempts = 0
+        self.running = False
+        self.thread = None
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        outbox.add_listener(self._wakeup.set)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='outbox-drainer', daemon=True)
+        self.thread.start()
+        logger.info("Outbox drainer started")
+
+    def _run(self):
+        delay = self.retry_delay
+        while self.running:
+            # Cleared before reading so an append during the batch wakes us again.
+            self._wakeup.clear()
+            try:
+                sent_all = self.drain_once()
+            except Exception as e:
+                logger.error(f"Error draining outbox: {e}", exc_info=True)
+                sent_all = False
+
+            if sent_all is None:
+                # Nothing pending: sleep until notified or the poll interval passes.
+                self._wakeup.wait(self.poll_interval)
+            elif sent_all:
+                delay = self.retry_delay
+            else:
+                logger.warning(f"Outbox delivery failed; retrying in {delay:.1f}s")
+                self._stopped.wait(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+    def drain_once(self) -> Optional[bool]:
+        """
+        Forward one batch.
+
+        Returns:
+            None if the outbox was empty, True if the whole batch was
+            delivered, False if any entry failed
+        """
+        batch = self.outbox.fetch_batch(self.batch_size)
+        if not batch:
+            return None
+        results = self.send_batch([(topic, event) for _, topic, event in batch])
+        delivered = [entry_id for (entry_id, _, _), ok in zip(batch, results) if ok]
+        failed = [entry_id for (entry_id, _, _), ok in zip(batch, results) if not ok]
+        self.outbox.delete(delivered)
+        self.outbox.mark_failed(failed)
+        self.delivered += len(delivered)
+        self.failed_attempts += len(failed)
+        return not failed
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the drainer thread; pending entries stay in the outbox."""
+        self.running = False
+        self._stopped.set()
+        self._wakeup.set()
+        if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
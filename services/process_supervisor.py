@@ -0,0 +1,168 @@
+"""
+Supervisor that runs event processing across several worker processes.
+
+Each worker is a separate interpreter, so CPU-bound handler work is no
+longer capped by one GIL. Workers that exit unexpectedly are restarted, and
+the stats they report are merged into a single view.
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Callable run in each worker: target(worker_index, worker_count, stats_queue).
+# Workers report progress with stats_queue.put((worker_index, stats_dict)).
+WorkerTarget = Callable[[int, int, Any], None]
+
+
+def merge_stats(total: Dict[str, Any], stats: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fold one worker's stats into a running total.
+
+    Numbers are summed, except keys starting with 'max_' which keep the
+    maximum; nested dictionaries are merged recursively.
+    """
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            total[key] = merge_stats(dict(total.get(key, {})), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            if key.startswith('max_'):
+                total[key] = max(total.get(key, value), value)
+            else:
+                total[key] = total.get(key, 0) + value
+    return total
+
+
+class ProcessSupervisor:
+    """
+    Starts N worker processes, restarts crashed ones and aggregates their stats.
+    """
+
+    def __init__(self, target: WorkerTarget, workers: Optional[int] = None,
+                 restart_delay: float = 1.0, max_restart_delay: float = 30.0,
+                 stats_interval: float = 30.0):
+        """
+        Initialize the supervisor.
+
+        Args:
+            target: Top-level (picklable) function run in each worker
+            workers: Number of worker processes (default: CPU count)
+            restart_delay: Initial delay before restarting a crashed worker (default: 1 s)
+            max_restart_delay: Upper bound for the doubling restart delay (default: 30 s)
+            stats_interval: Seconds between aggregated stats log lines (default: 30 s)
+        """
+        self.target = target
+        self.workers = workers or os.cpu_count() or 1
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.stats_interval = stats_interval
+        self.stats_queue = multiprocessing.Queue()
+        self.running = False
+
+        self._processes = {}          # worker index -> Process
+        self._restart_at = {}         # worker index -> monotonic time of next restart
+        self._delays = {}             # worker index -> current restart delay
+        self._latest = {}             # worker index -> last reported stats
+        self._retired = {}            # stats from worker processes that have exited
+        self.restarts = 0
+
+    def _spawn(self, index: int):
+        process = multiprocessing.Process(
+            target=self.target,
+            args=(index, self.workers, self.stats_queue),
+            name=f"event-worker-{index}",
+            daemon=False
+        )
+        process.start()
+        self._processes[index] = process
+        self._latest.pop(index, None)
+        logger.info(f"Started worker {index} (pid {process.pid})")
+
+    def start(self):
+        """Start every worker process."""
+        self.running = True
+        for index in range(self.workers):
+            self._spawn(index)
+            self._delays[index] = self.restart_delay
+
+    def _check_workers(self):
+        now = time.monotonic()
+        for index, process in list(self._processes.items()):
+            if process.is_alive():
+                continue
+            if index not in self._restart_at:
+                logger.error(f"Worker {index} (pid {process.pid}) exited with code {process.exitcode}")
+                merge_stats(self._retired, self._latest.pop(index, {}))
+                delay = self._delays[index]
+                self._restart_at[index] = now + delay
+                self._delays[index] = min(delay * 2, self.max_restart_delay)
+            elif now >= self._restart_at[index]:
+                del self._restart_at[index]
+                self.restarts += 1
+                self._spawn(index)
+
+    def _drain_stats(self, timeout: float):
+        try:
+            index, stats = self.stats_queue.get(timeout=timeout)
+        except queue.Empty:
+            return
+        while True:
+            if index in self._processes and index not in self._restart_at:
+                self._latest[index] = stats
+                # A worker that keeps reporting is healthy; reset its backoff.
+                self._delays[index] = self.restart_delay
+            try:
+                index, stats = self.stats_queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def aggregate_stats(self) -> Dict[str, Any]:
+        """Stats summed across live workers and workers that have exited."""
+        total = merge_stats({}, self._retired)
+        for stats in self._latest.values():
+            merge_stats(total, stats)
+        total['workers'] = sum(1 for p in self._processes.values() if p.is_alive())
+        total['restarts'] = self.restarts
+        return total
+
+    def run_forever(self):
+        """Start workers (if needed) and supervise until stop() or a signal."""
+        if not self.running:
+            self.start()
+
+        def handle_signal(sig, frame):
+            self.running = False
+
+        signal.signal(signal.SIGINT, handle_signal)
+        signal.signal(signal.SIGTERM, handle_signal)
+
+        last_log = time.monotonic()
+        while self.running:
+            self._drain_stats(timeout=0.5)
+            self._check_workers()
+            if time.monotonic() - last_log >= self.stats_interval:
+                logger.info(f"Aggregated stats: {self.aggregate_stats()}")
+                last_log = time.monotonic()
+        self.stop()
+
+    def stop(self, timeout: float = 10.0):
+        """Ask every worker to shut down (SIGTERM) and wait for them."""
+        self.running = False
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in self._processes.values():
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Worker pid {process.pid} did not stop; killing it")
+                process.kill()
+                process.join()
+        # Collect the final reports sent during shutdown.
+        self._drain_stats(timeout=0.1)
+        logger.info(f"Final aggregated stats: {self.aggregate_stats()}")
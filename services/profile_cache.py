@@ -0,0 +1,181 @@
+"""
+Read-through in-memory cache for profile rows.
+
+Lookups are served from dictionaries and only fall through to SQLite on a
+miss. Entries are invalidated precisely by the mutating functions in
+``services.db`` (via its change listeners) and by ``profile_events`` received
+from other processes through ``EventSubscriber``.
+
+Writers that publish no events (another dashboard without the outbox relay,
+a CLI, a bulk import in another process) are caught by ``PRAGMA
+data_version``: every lookup reads it on the cache's own connection, which
+costs a few microseconds, and drops everything once any other connection
+has committed.
+"""
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from . import db
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class ProfileCache:
+    """
+    Profile cache keyed by id, plus a dedicated slot for the active profile.
+
+    Rows are the same tuples returned by ``services.db`` so callers can swap
+    ``fetch_*`` calls for cache lookups without other changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rows = {}          # id -> row tuple (None while stale placeholder)
+        self._stale = set()      # ids whose cached row must be reloaded
+        self._complete = False   # True when _rows holds every profile
+        self._active = _MISSING
+        self._version_conn = None  # private connection polled for data_version
+        self._data_version = None
+        self.hits = 0
+        self.misses = 0
+
+    def _check_data_version(self):
+        """Drop everything if the database changed since the last lookup (caller holds the lock)."""
+        if self._version_conn is None:
+            self._version_conn = db.open_connection()
+        version = self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            # Also fires after this process's own writes (they use other
+            # connections); those were already applied precisely, so this
+            # only costs a reload.
+            self.invalidate()
+            self._data_version = version
+
+    def get_profile(self, profile_id) -> Optional[tuple]:
+        """Return the profile row for an id, loading it on a miss."""
+        profile_id = int(profile_id)
+        with self._lock:
+            self._check_data_version()
+            if profile_id in self._rows and profile_id not in self._stale:
+                self.hits += 1
+                return self._rows[profile_id]
+            self.misses += 1
+            return self._reload(profile_id)
+
+    def get_active_profile(self) -> Optional[tuple]:
+        """Return the active profile row (or None), loading it on a miss."""
+        with self._lock:
+            self._check_data_version()
+            if self._active is not _MISSING:
+                self.hits += 1
+                return self._active
+            self.misses += 1
+            self._active = db.fetch_active_profile()
+            return self._active
+
+    def get_profiles(self) -> List[tuple]:
+        """Return every profile row ordered by id."""
+        with self._lock:
+            self._check_data_version()
+            if not self._complete:
+                self.misses += 1
+                self._rows = {row[0]: row for row in db.fetch_profiles()}
+                self._stale.clear()
+                self._complete = True
+            else:
+                self.hits += 1
+                for profile_id in list(self._stale):
+                    self._reload(profile_id)
+            return list(self._rows.values())
+
+    def _reload(self, profile_id: int) -> Optional[tuple]:
+        row = db.fetch_profile_by_id(profile_id)
+        self._stale.discard(profile_id)
+        if row is None:
+            self._rows.pop(profile_id, None)
+        else:
+            self._rows[profile_id] = row
+        return row
+
+    def invalidate(self, profile_id=None):
+        """Drop one cached profile, or everything when no id is given."""
+        with self._lock:
+            if profile_id is None:
+                self._rows.clear()
+                self._stale.clear()
+                self._complete = False
+                self._active = _MISSING
+                return
+            profile_id = int(profile_id)
+            if profile_id in self._rows:
+                self._stale.add(profile_id)
+            if self._active is not _MISSING and (self._active is None or self._active[0] == profile_id):
+                self._active = _MISSING
+
+    def on_profile_changed(self, action: str, profile_id):
+        """
+        Apply a change notification.
+
+        Args:
+            action: "created", "updated", "deleted" or "reset"
+            profile_id: The affected profile ID (None for "reset")
+        """
+        if action == "reset" or profile_id is None:
+            with self._lock:
+                if action == "reset" and self._version_conn is not None:
+                    # The database path changed; poll the new file.
+                    self._version_conn.close()
+                    self._version_conn = None
+                    self._data_version = None
+                self.invalidate()
+            return
+
+        profile_id = int(profile_id)
+        with self._lock:
+            if action == "created":
+                if self._complete:
+                    # Placeholder keeps id ordering; the row loads lazily.
+                    self._rows[profile_id] = None
+                    self._stale.add(profile_id)
+                self._active = _MISSING
+            elif action == "updated":
+                self._stale.add(profile_id)
+                # update_profile deactivates every other profile.
+                for other_id, row in self._rows.items():
+                    if other_id != profile_id and row is not None and int(row[1]):
+                        self._rows[other_id] = (row[0], 0) + tuple(row[2:])
+                self._active = _MISSING
+            elif action == "deleted":
+                self._rows.pop(profile_id, None)
+                self._stale.discard(profile_id)
+                if self._active not in (_MISSING, None) and self._active[0] == profile_id:
+                    self._active = _MISSING
+            else:
+                self.invalidate()
+
+    def handle_profile_event(self, topic: str, event_data: Dict[str, Any]):
+        """
+        EventSubscriber handler for the ``profile_events`` topic.
+
+        Keeps this process's cache coherent with changes made elsewhere.
+        """
+        event_type = event_data.get('event_type', '')
+        action = event_type[len('profile_'):] if event_type.startswith('profile_') else ''
+        if action in ('created', 'updated', 'deleted'):
+            self.on_profile_changed(action, event_data.get('profile_id'))
+        else:
+            logger.debug(f"Invalidating profile cache for event: {event_type or 'unknown'}")
+            self.invalidate()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'cached_profiles': len(self._rows)}
+
+
+# Process-wide cache kept coherent with local writes.
+profile_cache = ProfileCache()
+db.add_change_listener(profile_cache.on_profile_changed)
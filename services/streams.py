@@ -0,0 +1,187 @@
+"""
+Redis Streams transport for topics that need durable, load-balanced delivery.
+
+Pub/sub drops every event published while no subscriber is connected and
+delivers each event to every subscriber. Topics routed through a stream are
+appended with XADD (trimmed to an approximate MAXLEN), read through a
+consumer group with XREADGROUP so each event goes to one consumer of the
+group, and acknowledged with XACK only after the handler succeeds. Entries
+left pending by a crashed consumer are reclaimed with XAUTOCLAIM, giving
+at-least-once delivery.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+import redis
+
+from . import codec
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY_PREFIX = 'stream:'
+PAYLOAD_FIELD = b'payload'
+DEFAULT_GROUP = 'event_processors'
+DEFAULT_MAXLEN = 10000
+
+# Comma-separated topics to route through streams when a publisher or
+# subscriber is not given stream_topics explicitly, so every process agrees.
+STREAM_TOPICS_ENV = 'EVENT_STREAM_TOPICS'
+
+
+def stream_key(topic: str) -> str:
+    """Redis key of the stream backing a topic."""
+    return f"{STREAM_KEY_PREFIX}{topic}"
+
+
+def configured_stream_topics() -> Set[str]:
+    """Topics listed in the EVENT_STREAM_TOPICS environment variable."""
+    return {t.strip() for t in os.environ.get(STREAM_TOPICS_ENV, '').split(',') if t.strip()}
+
+
+def default_consumer_name() -> str:
+    """Consumer name unique to this host and process."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class StreamConsumer:
+    """
+    Reads stream-backed topics through a consumer group.
+
+    Each entry is passed to `dispatch(topic, event_data, ack)`; the consumer
+    calls nothing else on the entry, so the dispatcher decides where the
+    handler runs and must call `ack()` once the handler has succeeded.
+    """
+
+    def __init__(self, redis_client: redis.Redis, topics: Iterable[str],
+                 dispatch: Callable[[str, Dict[str, Any], Callable[[], None]], None],
+                 group: str = DEFAULT_GROUP, consumer_name: Optional[str] = None,
+                 batch_size: int = 100, block_ms: int = 1000,
+                 claim_idle_ms: int = 60000, claim_interval: float = 30.0):
+        """
+        Initialize the consumer. Call `start()` to begin reading.
+
+        Args:
+            redis_client: Client created with decode_responses=False
+            topics: Topics to read (their streams are created if missing)
+            dispatch: Callable receiving (topic, event_data, ack)
+            group: Consumer group name shared by all processor instances
+            consumer_name: This consumer's name (default: host-pid)
+            batch_size: Maximum entries fetched per XREADGROUP (default: 100)
+            block_ms: How long XREADGROUP blocks waiting for entries (default: 1000)
+            claim_idle_ms: Pending entries idle this long are reclaimed (default: 60000)
+            claim_interval: Seconds between reclaim passes (default: 30)
+        """
+        self.redis_client = redis_client
+        self.topics = list(topics)
+        self.dispatch = dispatch
+        self.group = group
+        self.consumer_name = consumer_name or default_consumer_name()
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval = claim_interval
+        self.running = False
+        self.thread = None
+        self._topic_by_key = {stream_key(topic).encode('utf-8'): topic for topic in self.topics}
+
+    def ensure_groups(self):
+        """Create the consumer group on every stream (idempotent)."""
+        for topic in self.topics:
+            try:
+                # id='0' so a new group also sees entries published before it existed
+                self.redis_client.xgroup_create(stream_key(topic), self.group, id='0', mkstream=True)
+                logger.info(f"Created consumer group '{self.group}' on stream for topic: {topic}")
+            except redis.ResponseError as e:
+                if 'BUSYGROUP' not in str(e):
+                    raise
+
+    def start(self):
+        """Create groups and start the reader thread."""
+        self.ensure_groups()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='stream-consumer', daemon=True)
+        self.thread.start()
+        logger.info(f"Stream consumer '{self.consumer_name}' started for topics: {', '.join(self.topics)}")
+
+    def _run(self):
+        # Entries delivered to this consumer name before a restart come first.
+        last_id = '0'
+        last_claim = time.monotonic()
+        while self.running:
+            try:
+                self._read(last_id)
+                last_id = '>'
+                if time.monotonic() - last_claim >= self.claim_interval:
+                    self.reclaim_pending()
+                    last_claim = time.monotonic()
+            except redis.ConnectionError as e:
+                logger.error(f"Lost connection while reading streams: {e}")
+                time.sleep(1)
+            except Exception as e:
+                logger.error(f"Error in stream consumer: {e}", exc_info=True)
+                time.sleep(1)
+
+    def _read(self, last_id: str):
+        streams = {stream_key(topic): last_id for topic in self.topics}
+        response = self.redis_client.xreadgroup(
+            self.group, self.consumer_name, streams,
+            count=self.batch_size, block=self.block_ms if last_id == '>' else None
+        )
+        for key, entries in response or []:
+            topic = self._topic_by_key[key]
+            for entry_id, fields in entries:
+                self._deliver(topic, entry_id, fields)
+
+    def reclaim_pending(self) -> int:
+        """
+        Take over entries other consumers left unacknowledged for too long.
+
+        Returns:
+            int: Number of entries reclaimed and redelivered
+        """
+        reclaimed = 0
+        for topic in self.topics:
+            start_id = '0-0'
+            while True:
+                result = self.redis_client.xautoclaim(
+                    stream_key(topic), self.group, self.consumer_name,
+                    min_idle_time=self.claim_idle_ms, start_id=start_id, count=self.batch_size
+                )
+                start_id, entries = result[0], result[1]
+                for entry_id, fields in entries:
+                    self._deliver(topic, entry_id, fields)
+                    reclaimed += 1
+                if not entries or start_id in (b'0-0', '0-0'):
+                    break
+        if reclaimed:
+            logger.warning(f"Reclaimed {reclaimed} pending stream entries")
+        return reclaimed
+
+    def _deliver(self, topic: str, entry_id: bytes, fields: Dict[bytes, bytes]):
+        key = stream_key(topic)
+
+        def ack():
+            self.redis_client.xack(key, self.group, entry_id)
+
+        if not fields or PAYLOAD_FIELD not in fields:
+            # Trimmed or malformed entry: nothing to process, drop it.
+            ack()
+            return
+        try:
+            event_data = codec.decode(fields[PAYLOAD_FIELD])
+        except codec.CodecError as e:
+            logger.error(f"Failed to parse stream entry {entry_id!r} on topic '{topic}': {e}")
+            ack()
+            return
+        logger.debug(f"Received stream event on topic '{topic}': {event_data.get('event_type', 'unknown')}")
+        self.dispatch(topic, event_data, ack)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop reading; returns once the current XREADGROUP call finishes."""
+        self.running = False
+        if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
@@ -0,0 +1,120 @@
+"""
+Background worker bridge for Tk.
+
+Tk widgets may only be touched from the thread running mainloop, so blocking
+work (SQLite queries, file I/O, Redis) runs on worker threads and hands its
+result back through a queue that the Tk thread drains with ``root.after``.
+Callbacks therefore always run on the Tk thread, and the event loop never
+waits on I/O.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Poll interval while jobs are outstanding; one frame at 60 fps.
+POLL_INTERVAL_MS = 16
+
+
+class BackgroundRunner:
+    """
+    Runs callables on worker threads and delivers results on the Tk thread.
+    """
+
+    def __init__(self, root, workers=2, on_error=None):
+        """
+        Initialize the runner.
+
+        Args:
+            root: Tk root whose event loop receives the results
+            workers: Number of worker threads (default: 2)
+            on_error: Default callback for failed jobs, called as on_error(exc)
+        """
+        self.root = root
+        self.on_error = on_error
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ui-worker")
+        self._results = queue.Queue()
+        self._outstanding = 0
+        self._lock = threading.Lock()
+        self._poll_job = None
+        self._closed = False
+
+    def submit(self, func, *args, on_success=None, on_error=None, owner=None):
+        """
+        Run func(*args) on a worker thread.
+
+        Args:
+            func: Blocking callable
+            *args: Arguments for func
+            on_success: Called on the Tk thread with the return value
+            on_error: Called on the Tk thread with the exception (default: the
+                runner's on_error, else the error is logged)
+            owner: Optional widget; callbacks are skipped if it was destroyed
+                meanwhile (e.g. the user switched views)
+        """
+        if self._closed:
+            return
+        with self._lock:
+            self._outstanding += 1
+        self._executor.submit(self._run, func, args, on_success, on_error, owner)
+        self._ensure_polling()
+
+    def post(self, callback, *args):
+        """
+        Run callback(*args) on the Tk thread; safe to call from any thread.
+
+        Meant for jobs reporting progress: results are only polled while a
+        submitted job is outstanding.
+        """
+        self._results.put((callback, args, None))
+
+    def _run(self, func, args, on_success, on_error, owner):
+        try:
+            result = func(*args)
+            callback = on_success
+        except Exception as e:
+            result = e
+            callback = on_error or self.on_error
+            if callback is None:
+                logger.error(f"Background job {getattr(func, '__name__', func)} failed: {e}", exc_info=True)
+        # Queue the result before dropping the count, so _poll always sees
+        # either the job as outstanding or its result waiting.
+        self._results.put((callback, (result,), owner))
+        with self._lock:
+            self._outstanding -= 1
+
+    def _ensure_polling(self):
+        # Only called from the Tk thread (submit), so no race on _poll_job.
+        if self._poll_job is None and not self._closed:
+            self._poll_job = self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                callback, args, owner = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if callback is None or (owner is not None and not owner.winfo_exists()):
+                continue
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error(f"Error in background job callback: {e}", exc_info=True)
+        with self._lock:
+            busy = self._outstanding > 0
+        if busy or not self._results.empty():
+            self._ensure_polling()
+
+    def shutdown(self):
+        """Stop accepting jobs; running jobs finish but their callbacks are dropped."""
+        self._closed = True
+        if self._poll_job is not None:
+            try:
+                self.root.after_cancel(self._poll_job)
+            except Exception:
+                pass
+            self._poll_job = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
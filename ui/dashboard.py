@@ -1,9 +1,20 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkinter import font as tkfont
-from services.db import initialize_db, fetch_profiles, fetch_profile_by_id, insert_profile, update_profile, delete_profile
+from services.db import initialize_db, fetch_profile_by_id, fetch_profiles_page, search_profiles, PROFILE_PAGE_SIZE
+from services.crud import insert_profile, update_profile, delete_profile
+from services.profile_cache import profile_cache
+from services import bulk
+from services.events import PROFILE_TOPIC
+from ui.background import BackgroundRunner
+from ui import startup
 import tkinter.filedialog as fd
+import logging
 import os
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
 
 # Basic color palette to resemble the provided design (softer tones)
 ACCENT = "#2a5b74"
@@ -14,14 +25,67 @@ ERROR = "#e25555"          # softer red
 ERROR_HOVER = "#cc4a4a"
 BORDER = "#dfe5ea"         # soft border color
 
+SEARCH_DEBOUNCE_MS = 200
+# How often the Tk thread drains queued profile_events in --live mode; all
+# events arriving within one interval cause a single refresh. An empty poll
+# is one queue check.
+LIVE_UPDATE_INTERVAL_MS = 100
+
+PROFILE_FILETYPES = [("CSV Files", "*.csv"), ("JSON Lines", "*.jsonl"), ("All Files", "*.*")]
+
+def sync_tree_rows(tree, rows, append=False):
+    """
+    Make a Treeview show profile rows, touching only items that changed.
+
+    Items are keyed by profile id. Changed rows are updated in place,
+    missing ones inserted, and the order fixed with one set_children call.
+    Unless append is set, items not in rows are deleted; with append the
+    rows are added after the existing items.
+    """
+    wanted = []
+    for row in rows:
+        iid = str(row[0])
+        values = (str(row[0]), "Yes" if int(row[1]) == 1 else "No", str(row[2]), str(row[3]), "Edit", "Delete")
+        if tree.exists(iid):
+            if tuple(str(v) for v in tree.item(iid, "values")) != values:
+                tree.item(iid, values=values)
+        else:
+            tree.insert("", "end", iid=iid, values=values)
+        wanted.append(iid)
+
+    current = tree.get_children()
+    wanted_set = set(wanted)
+    if append:
+        wanted = [iid for iid in current if iid not in wanted_set] + wanted
+    else:
+        stale = [iid for iid in current if iid not in wanted_set]
+        if stale:
+            tree.delete(*stale)
+            current = tree.get_children()
+    if list(current) != wanted:
+        tree.set_children("", *wanted)
+
+
 class DashboardApp:
-    def __init__(self, root):
+    def __init__(self, root, live_updates=False, redis_host="localhost", redis_port=6379):
         self.root = root
         self.root.title("Dashboard")
         self.root.geometry("1200x720")
 
-        # Initialize the database
-        initialize_db()
+        # Only widgets are built here so the window paints as early as
+        # possible; the database, the icon and the optional Redis connection
+        # are set up by _deferred_startup once the event loop is idle.
+        self._db_ready = False
+        self._live_updates = (redis_host, redis_port) if live_updates else None
+
+        # Every other data operation runs on this runner's worker threads so
+        # a locked database or slow disk never blocks the Tk event loop.
+        self.runner = BackgroundRunner(self.root, on_error=self._show_background_error)
+        self._saving = False
+        self._bulk_running = False
+        self._live_events = queue.Queue()
+        self._live_subscriber = None
+        self._live_job = None
 
         # Typography defaults
         self.font_heading = ("Segoe UI", 18, "bold")
@@ -33,22 +97,15 @@ class DashboardApp:
         self.root.option_add("*Label.Font", self.font_body)
         self.root.option_add("*Entry.Font", self.font_body)
 
-        # Remove top bar; only set window icon if available
-        try:
-            self.logo_img = tk.PhotoImage(file="logo.png")
-            self.root.iconphoto(True, self.logo_img)
-        except Exception:
-            self.logo_img = None
+        self.logo_img = None
 
         # Footer band (pack bottom BEFORE side frames so it spans full width)
         self.footer = tk.Frame(self.root, bg="#8c9bab", height=56)
         self.footer.pack(side="bottom", fill="x")
         tk.Label(self.footer, text="POWERED BY RADIANT INFOTECH", bg="#8c9bab", fg="white").pack(side="left", padx=18)
-        if self.logo_img is not None:
-            self.logo_footer = self.logo_img.subsample(2, 2)
-            tk.Label(self.footer, image=self.logo_footer, bg="#8c9bab").pack(side="left", padx=18)
-        else:
-            tk.Label(self.footer, text="RADIANT InfoTech Nepal", bg="#8c9bab", fg="white").pack(side="left", padx=18)
+        # Replaced by the logo once it is loaded
+        self.footer_logo = tk.Label(self.footer, text="RADIANT InfoTech Nepal", bg="#8c9bab", fg="white")
+        self.footer_logo.pack(side="left", padx=18)
         tk.Label(self.footer, text="CC RADIANT INFOTECH", bg="#8c9bab", fg="white").pack(side="right", padx=18)
 
         # Body frame between topbar and footer, holds sidebar and main area
@@ -62,6 +119,11 @@ class DashboardApp:
         # Ensure the main content adjusts to the remaining space
         self.main_content = tk.Frame(self.body, bg=LIGHT_BG)
         self.main_content.pack(side="right", fill="both", expand=True)
+        self._views = {}
+        self._current_view = None
+        self._button_font = None
+        self._button_sizes = {}
+        self._configure_styles()
 
         
       
@@ -102,52 +164,82 @@ class DashboardApp:
         # Show default screen (Home dashboard)
         self.show_home()
 
+        self.root.after_idle(self._deferred_startup)
+
+    def _deferred_startup(self):
+        # Idle callbacks run in order, so by now the window has been mapped
+        # and drawn.
+        startup.mark("first paint")
+
+        # Remove top bar; only set window icon if available
+        try:
+            self.logo_img = tk.PhotoImage(file="logo.png")
+            self.root.iconphoto(True, self.logo_img)
+            self.logo_footer = self.logo_img.subsample(2, 2)
+            self.footer_logo.config(image=self.logo_footer)
+        except Exception:
+            self.logo_img = None
+        startup.mark("icon loaded")
+
+        # Migrations can take a while (e.g. building the search index), so
+        # they run on a worker; views load their data once it is done.
+        self.runner.submit(initialize_db, on_success=self._on_db_ready)
+
+    def _on_db_ready(self, _result):
+        startup.mark("database ready")
+        self._db_ready = True
+        self.refresh_view()
+        if self._live_updates:
+            self.start_live_updates(*self._live_updates)
+
     def _create_rounded_button(self, parent, text, command, bg, hover_bg, fg="white", padding_x=16, padding_y=8, radius=10, pack_kwargs=None):
-        # Canvas-based rounded button
+        # Canvas-based rounded button. The shapes are drawn once; hover and
+        # active changes only recolor them with itemconfigure, and are
+        # skipped entirely when the colors would not change.
         pack_kwargs = pack_kwargs or {}
         parent_bg = parent.cget("bg")
-        font_obj = tkfont.Font(font=self.font_button)
-        text_width = font_obj.measure(text)
-        text_height = font_obj.metrics("linespace")
-        width = text_width + padding_x * 2
-        height = text_height + padding_y * 2
+        width, height = self._button_size(text, padding_x, padding_y)
 
         canvas = tk.Canvas(parent, width=width, height=height, bg=parent_bg, highlightthickness=0, bd=0, cursor="hand2")
         canvas.is_active = False
-
-        # draw the button; text_color defaults to fg
+        canvas.colors = None
+
+        r = radius
+        w = width
+        h = height
+        # Draw background halo (to hide jagged edges) slightly larger using parent bg
+        pb = parent_bg
+        canvas.create_arc(-1, -1, 2*r+1, 2*r+1, start=90, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
+        canvas.create_arc(w-2*r-1, -1, w+1, 2*r+1, start=0, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
+        canvas.create_arc(-1, h-2*r-1, 2*r+1, h+1, start=180, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
+        canvas.create_arc(w-2*r-1, h-2*r-1, w+1, h+1, start=270, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
+        canvas.create_rectangle(r, -1, w-r, h+1, fill=pb, outline=pb, tags="btn")
+        canvas.create_rectangle(-1, r, w+1, h-r, fill=pb, outline=pb, tags="btn")
+
+        # Foreground rounded button; "face" shapes are recolored per state
+        canvas.create_arc(0, 0, 2*r, 2*r, start=90, extent=90, style="pieslice", tags=("btn", "face"))
+        canvas.create_arc(w-2*r, 0, w, 2*r, start=0, extent=90, style="pieslice", tags=("btn", "face"))
+        canvas.create_arc(0, h-2*r, 2*r, h, start=180, extent=90, style="pieslice", tags=("btn", "face"))
+        canvas.create_arc(w-2*r, h-2*r, w, h, start=270, extent=90, style="pieslice", tags=("btn", "face"))
+        canvas.create_rectangle(r, 0, w-r, h, tags=("btn", "face"))
+        canvas.create_rectangle(0, r, w, h-r, tags=("btn", "face"))
+        # Use a separate tag for the label so we can recolor text without affecting shapes
+        canvas.create_text(w/2, h/2, text=text, font=self.font_button, tags=("btn", "label"))
+
+        # recolor the button; text_color defaults to fg
         def draw_button(fill_color, text_color=None):
-            canvas.delete("btn")
-            r = radius
-            w = width
-            h = height
-            # Draw background halo (to hide jagged edges) slightly larger using parent bg
-            pb = parent_bg
-            canvas.create_arc(-1, -1, 2*r+1, 2*r+1, start=90, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
-            canvas.create_arc(w-2*r-1, -1, w+1, 2*r+1, start=0, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
-            canvas.create_arc(-1, h-2*r-1, 2*r+1, h+1, start=180, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
-            canvas.create_arc(w-2*r-1, h-2*r-1, w+1, h+1, start=270, extent=90, style="pieslice", fill=pb, outline=pb, tags="btn")
-            canvas.create_rectangle(r, -1, w-r, h+1, fill=pb, outline=pb, tags="btn")
-            canvas.create_rectangle(-1, r, w+1, h-r, fill=pb, outline=pb, tags="btn")
-
-            # Foreground rounded button
-            canvas.create_arc(0, 0, 2*r, 2*r, start=90, extent=90, style="pieslice", fill=fill_color, outline=fill_color, tags="btn")
-            canvas.create_arc(w-2*r, 0, w, 2*r, start=0, extent=90, style="pieslice", fill=fill_color, outline=fill_color, tags="btn")
-            canvas.create_arc(0, h-2*r, 2*r, h, start=180, extent=90, style="pieslice", fill=fill_color, outline=fill_color, tags="btn")
-            canvas.create_arc(w-2*r, h-2*r, w, h, start=270, extent=90, style="pieslice", fill=fill_color, outline=fill_color, tags="btn")
-            canvas.create_rectangle(r, 0, w-r, h, fill=fill_color, outline=fill_color, tags="btn")
-            canvas.create_rectangle(0, r, w, h-r, fill=fill_color, outline=fill_color, tags="btn")
-            # Use a separate tag for the label so we can recolor text without affecting shapes
-            canvas.create_text(w/2, h/2, text=text, fill=(text_color or fg), font=self.font_button, tags=("btn", "label"))
+            colors = (fill_color, text_color or fg)
+            if colors == canvas.colors:
+                return
+            canvas.colors = colors
+            canvas.itemconfigure("face", fill=fill_color, outline=fill_color)
+            canvas.itemconfigure("label", fill=colors[1])
 
         draw_button(bg)
 
         def on_enter(_):
-            # If active, keep active style; otherwise show hover
-            if canvas.is_active:
-                draw_button(hover_bg, text_color="white")
-            else:
-                draw_button(hover_bg, text_color="white")
+            # Active or not, hovering shows the hover style
+            draw_button(hover_bg, text_color="white")
 
         def on_leave(_):
             # Restore based on active state
@@ -172,23 +264,122 @@ class DashboardApp:
         canvas.set_active = _set_active
         return canvas
 
-    def show_home(self):
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
+    def _button_size(self, text, padding_x, padding_y):
+        # Font measurement round-trips through Tk; forms rebuild the same
+        # few buttons every time they open, so remember each size.
+        key = (text, padding_x, padding_y)
+        size = self._button_sizes.get(key)
+        if size is None:
+            if self._button_font is None:
+                self._button_font = tkfont.Font(font=self.font_button)
+            width = self._button_font.measure(text) + padding_x * 2
+            height = self._button_font.metrics("linespace") + padding_y * 2
+            size = self._button_sizes[key] = (width, height)
+        return size
+
+    def start_live_updates(self, host="localhost", port=6379):
+        # Subscribe to profile_events so changes made by other dashboards or
+        # processes appear without navigating. Events arrive on the
+        # subscriber's thread and are only queued there; no Tk call is made
+        # off the Tk thread. An after() poll on the Tk thread drains the
+        # queue and refreshes the visible view once per batch.
+        def on_event(topic, event_data):
+            profile_cache.handle_profile_event(topic, event_data)
+            self._live_events.put(event_data)
+
+        def connect():
+            from services.event_subscriber import EventSubscriber
+            # Pub/sub rather than a stream consumer group: every dashboard
+            # needs every event, not a share of them.
+            subscriber = EventSubscriber(host, port, dispatch_mode="pool", max_workers=1, stream_topics=())
+            subscriber.subscribe([PROFILE_TOPIC], on_event)
+            return subscriber
+
+        def on_connected(subscriber):
+            self._live_subscriber = subscriber
+            self._live_job = self.root.after(LIVE_UPDATE_INTERVAL_MS, self._apply_live_events)
+
+        def on_failed(e):
+            logger.warning(f"Live profile updates unavailable: {e}")
+
+        self.runner.submit(connect, on_success=on_connected, on_error=on_failed)
+
+    def _apply_live_events(self):
+        self._live_job = self.root.after(LIVE_UPDATE_INTERVAL_MS, self._apply_live_events)
+        changed = 0
+        try:
+            while True:
+                self._live_events.get_nowait()
+                changed += 1
+        except queue.Empty:
+            pass
+        if changed:
+            self.refresh_view()
+
+    def refresh_view(self):
+        """Reload the current view's data in place."""
+        if not self._db_ready:
+            return  # _on_db_ready refreshes the view
+        # Forms have no refresh, so an edit in progress is left alone;
+        # hidden views refresh when next shown.
+        refresh = getattr(self._current_view, "refresh", None)
+        if refresh is not None:
+            refresh()
+
+    def _configure_styles(self):
+        # ttk styles are global to the interpreter; configure them once
+        # rather than every time the Profiles view is shown.
+        style = ttk.Style()
+        style.theme_use("default")
+        style.configure("Treeview", background="white", foreground="#222", rowheight=28, fieldbackground="white")
+        style.configure("Treeview.Heading", background="#eef3f7", foreground="#222", relief="flat", font=("Segoe UI", 10, "bold"))
+        style.configure("Treeview", font=("Segoe UI", 10))
+        style.map("Treeview", background=[["selected", "#e8f0f5"]])
+
+    def _show_view(self, name, build):
+        # Home and Profiles are built once and kept; switching hides the
+        # current view and shows the other. Forms ("form") are per-profile
+        # and are destroyed when left.
+        current = self._current_view
+        if current is not None:
+            if current is self._views.get("form"):
+                del self._views["form"]
+                current.destroy()
+            elif current is not self._views.get(name):
+                current.pack_forget()
+
+        view = self._views.get(name)
+        if view is None:
+            view = tk.Frame(self.main_content, bg=LIGHT_BG)
+            build(view)
+            self._views[name] = view
+        if view is not current:
+            view.pack(fill="both", expand=True)
+        self._current_view = view
+        return view
 
+    def show_home(self):
         # Set active style for Home button
         self.home_btn_canvas.set_active(True)
         # Set inactive style for Profile button
         self.profiles_btn_canvas.set_active(False)
 
+        self._show_view("home", self._build_home)
+        self.refresh_view()
+
+    def _build_home(self, view):
         # --- Card 1: Active token display
-        token_panel = tk.Frame(self.main_content, bg="white")
+        token_panel = tk.Frame(view, bg="white")
         token_panel.pack(fill="x", padx=16, pady=(16, 8))
         tk.Label(token_panel, text="Welcome to Home", bg="white", fg="#22495e", font=self.font_heading).pack(anchor="w", pady=(0, 8))
-        from services.db import fetch_active_profile
-        active_profile = fetch_active_profile()
-        token_name = active_profile[3] if active_profile else "(None active)"
-      
+        token_name = tk.StringVar(value="Loading...")
+
+        def show_active(profile):
+            token_name.set(profile[3] if profile else "(None active)")
+            startup.finish("home view loaded")
+
+        def refresh():
+            self.runner.submit(profile_cache.get_active_profile, on_success=show_active, owner=token_panel)
 
         # --- Card 2: Key input form styled like render_profile_form
         def handle_key_submit(values):
@@ -204,26 +395,29 @@ class DashboardApp:
             defaults={"key": "", "token_name": token_name},
             on_submit=handle_key_submit,
             include_active=False,
-            custom_fields="key_form"
+            custom_fields="key_form",
+            parent=view,
         )
+        view.refresh = refresh
 
     def show_profiles(self):
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
-
         # Set active style for Profile button
         self.profiles_btn_canvas.set_active(True)
 
         # Set inactive style for Home button
         self.home_btn_canvas.set_active(False)
 
+        self._show_view("profiles", self._build_profiles)
+        self.refresh_view()
+
+    def _build_profiles(self, view):
         # Add content for Profile view
-        panel = tk.Frame(self.main_content, bg="white")
+        panel = tk.Frame(view, bg="white")
         panel.pack(fill="x", padx=16, pady=16)
         tk.Label(panel, text="Profile Section", bg="white", fg="#22495e", font=self.font_heading).pack(anchor="w", pady=(0, 8))
 
         # Header with title and "+ Profile" button
-        header = tk.Frame(self.main_content, bg="white", width=600)  # Set the width explicitly
+        header = tk.Frame(view, bg="white", width=600)  # Set the width explicitly
         header.pack(fill="x", padx=16, pady=16)
         tk.Label(header, text="Profiles", bg="white", fg=ACCENT, font=self.font_heading).pack(side="left")
         self._create_rounded_button(
@@ -234,17 +428,36 @@ class DashboardApp:
             hover_bg="#22495e",
             pack_kwargs={"side": "right", "padx": (0, 12)}
         )
-
-        # Create a treeview for the table
-        style = ttk.Style()
-        style.theme_use("default")
-        style.configure("Treeview", background="white", foreground="#222", rowheight=28, fieldbackground="white")
-        style.configure("Treeview.Heading", background="#eef3f7", foreground="#222", relief="flat", font=("Segoe UI", 10, "bold"))
-        style.configure("Treeview", font=("Segoe UI", 10))
-        style.map("Treeview", background=[["selected", "#e8f0f5"]])
+        self._create_rounded_button(
+            header,
+            text="Export",
+            command=self.export_profiles,
+            bg="#a9b5c1",
+            hover_bg="#94a3af",
+            pack_kwargs={"side": "right", "padx": (0, 12)}
+        )
+        self._create_rounded_button(
+            header,
+            text="Import",
+            command=self.import_profiles,
+            bg="#a9b5c1",
+            hover_bg="#94a3af",
+            pack_kwargs={"side": "right", "padx": (0, 12)}
+        )
+        self.bulk_status_var = tk.StringVar(value="")
+        tk.Label(header, textvariable=self.bulk_status_var, bg="white", fg="#22495e").pack(side="right", padx=(0, 12))
+
+        # Search box; filters the table as the user types
+        search_bar = tk.Frame(view, bg="white")
+        search_bar.pack(fill="x", padx=16, pady=(0, 8))
+        tk.Label(search_bar, text="Search", bg="white", fg=ACCENT).pack(side="left", padx=(12, 8), pady=8)
+        search_var = tk.StringVar(value="")
+        tk.Entry(search_bar, textvariable=search_var).pack(side="left", fill="x", expand=True, padx=(0, 12), pady=8)
+        loading_var = tk.StringVar(value="")
+        tk.Label(search_bar, textvariable=loading_var, bg="white", fg="#22495e", width=16, anchor="w").pack(side="right", padx=(0, 12))
 
         # Card to wrap table
-        card = tk.Frame(self.main_content, bg="white", highlightthickness=0, bd=0)
+        card = tk.Frame(view, bg="white", highlightthickness=0, bd=0)
         card.pack(fill="both", expand=True, padx=16, pady=(0, 16))
 
         columns = ("ID", "Active", "DLL Path", "Token Name", "Edit", "Delete")
@@ -263,13 +476,93 @@ class DashboardApp:
         tree.column("Edit", width=80, anchor="center")
         tree.column("Delete", width=80, anchor="center")
 
+        scrollbar = ttk.Scrollbar(card, orient="vertical", command=tree.yview)
+        scrollbar.pack(side="right", fill="y")
         tree.pack(fill="both", expand=True)
 
-        rows = fetch_profiles()
+        # Rows are loaded a page at a time as the user scrolls near the
+        # bottom, so opening the view costs one small query regardless of how
+        # many profiles exist. Without a search the pages are keyset ranges
+        # of ids; with one they are offsets into the ranked FTS results.
+        # Pages are fetched on the runner, and a page that arrives after the
+        # listing was reloaded (an older generation) is discarded.
+        paging = {"query": "", "last_id": 0, "offset": 0, "exhausted": False, "pending": False, "generation": 0}
+
+        def fetch_page(query, last_id, offset, limit):
+            if query:
+                return search_profiles(query, offset=offset, limit=limit)
+            return fetch_profiles_page(last_id, limit=limit)
+
+        def request_rows(last_id, offset, limit, apply):
+            paging["pending"] = True
+            loading_var.set("Loading...")
+            generation = paging["generation"]
+
+            def on_rows(rows):
+                if generation != paging["generation"]:
+                    return
+                paging["pending"] = False
+                loading_var.set("")
+                apply(rows)
+                if paging["query"]:
+                    paging["offset"] = len(tree.get_children())
+                elif rows:
+                    paging["last_id"] = rows[-1][0]
+                paging["exhausted"] = len(rows) < limit
+
+            def on_error(e):
+                if generation == paging["generation"]:
+                    paging["pending"] = False
+                    loading_var.set("Failed to load")
+                self._show_background_error(e)
+
+            self.runner.submit(
+                fetch_page, paging["query"], last_id, offset, limit,
+                on_success=on_rows, on_error=on_error, owner=tree,
+            )
 
-        for row in rows:
-            active_status = "Yes" if int(row[1]) == 1 else "No"
-            tree.insert("", "end", values=(row[0], active_status, row[2], row[3], "Edit", "Delete"))
+        def load_next_page():
+            # Scrolling (on_yscroll) can fire before migrations finish.
+            if not self._db_ready or paging["exhausted"] or paging["pending"]:
+                return
+            request_rows(paging["last_id"], paging["offset"], PROFILE_PAGE_SIZE,
+                         lambda rows: sync_tree_rows(tree, rows, append=True))
+
+        def reload(minimum=PROFILE_PAGE_SIZE):
+            # Re-read everything loaded so far (at least one page) and apply
+            # only the differences to the table.
+            if not self._db_ready:
+                return  # _on_db_ready refreshes the view (with any query typed meanwhile)
+            paging["generation"] += 1
+            paging.update(last_id=0, offset=0, exhausted=False)
+            limit = max(len(tree.get_children()), minimum)
+            request_rows(0, 0, limit, lambda rows: sync_tree_rows(tree, rows))
+
+        def on_yscroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) > 0.9:
+                load_next_page()
+
+        def run_search():
+            paging["search_job"] = None
+            query = search_var.get().strip()
+            if query == paging["query"] or not tree.winfo_exists():
+                return
+            paging["query"] = query
+            tree.yview_moveto(0)
+            # Only the first page of the new results is wanted.
+            for iid in tree.get_children()[PROFILE_PAGE_SIZE:]:
+                tree.delete(iid)
+            reload()
+
+        def on_search_changed(*_):
+            # Debounce: search once typing pauses rather than on every key.
+            if paging.get("search_job"):
+                self.root.after_cancel(paging["search_job"])
+            paging["search_job"] = self.root.after(SEARCH_DEBOUNCE_MS, run_search)
+
+        search_var.trace_add("write", on_search_changed)
+        tree.configure(yscrollcommand=on_yscroll)
 
         # Add edit and delete functionality
         def on_tree_select(event):
@@ -285,54 +578,62 @@ class DashboardApp:
                 self.delete_profile(values[0])
 
         tree.bind("<Button-1>", on_tree_select)
+        view.refresh = reload
 
     def edit_profile(self, profile_id):
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
-
-        profile = fetch_profile_by_id(profile_id)
-
-        if not profile:
-            messagebox.showerror("Error", "Profile not found!")
-            self.show_profiles()
-            return
-
-        def on_submit(values):
-            update_profile(profile_id, values.get("active", True), values["dll_path"], values["token_name"])
-            messagebox.showinfo("Success", "Profile updated successfully!")
-            self.show_profiles()
-
-        self.render_profile_form(
-            title="Edit Profile",
-            defaults={
-                "active": bool(int(profile[1])),
-                "dll_path": profile[2],
-                "token_name": profile[3],
-            },
-            include_active=True,
-            on_submit=on_submit,
-        )
+        def build(view):
+            loading = tk.Label(view, text="Loading profile...", bg=LIGHT_BG, fg="#22495e")
+            loading.pack(padx=24, pady=24, anchor="w")
+
+            def on_submit(values):
+                self._write_profile(
+                    update_profile, profile_id, values.get("active", True), values["dll_path"], values["token_name"],
+                    success_message="Profile updated successfully!",
+                )
+
+            def on_loaded(profile):
+                if not profile:
+                    messagebox.showerror("Error", "Profile not found!")
+                    self.show_profiles()
+                    return
+                loading.destroy()
+                self.render_profile_form(
+                    title="Edit Profile",
+                    defaults={
+                        "active": bool(int(profile[1])),
+                        "dll_path": profile[2],
+                        "token_name": profile[3],
+                    },
+                    include_active=True,
+                    on_submit=on_submit,
+                    parent=view,
+                )
+
+            # Read the row itself, not the cache: the form writes every field
+            # back on save, so stale values would overwrite a newer row.
+            self.runner.submit(fetch_profile_by_id, profile_id, on_success=on_loaded, owner=loading)
+
+        self._show_view("form", build)
 
     def add_new_profile(self):
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
-
         def on_submit(values):
-            insert_profile(0, values["dll_path"], values["token_name"])
-            messagebox.showinfo("Success", "Profile added successfully!")
-            self.show_profiles()
+            self._write_profile(
+                insert_profile, 0, values["dll_path"], values["token_name"],
+                success_message="Profile added successfully!",
+            )
 
         # In create form, active switch is not shown
-        self.render_profile_form(
+        self._show_view("form", lambda view: self.render_profile_form(
             title="Create Profile",
             defaults={"dll_path": "", "token_name": ""},
             include_active=False,
             on_submit=on_submit,
-        )
+            parent=view,
+        ))
 
-    def render_profile_form(self, title, defaults, on_submit, include_active=True, custom_fields=None):
+    def render_profile_form(self, title, defaults, on_submit, include_active=True, custom_fields=None, parent=None):
         # Card-like centered form reused by create/edit
-        container = tk.Frame(self.main_content, bg=LIGHT_BG, width=600)
+        container = tk.Frame(parent or self.main_content, bg=LIGHT_BG, width=600)
         container.pack(fill="both", expand=True)
 
         form_frame = tk.Frame(container, bg="white")
@@ -345,7 +646,9 @@ class DashboardApp:
         if custom_fields == "key_form":
             # Show the token name as in the Home panel, then a single Key entry
             tk.Label(form_frame, text="Token Name:", bg="white", fg=ACCENT).grid(row=row_idx, column=0, sticky="e", padx=(16, 8), pady=10)
-            tk.Label(form_frame, text=defaults.get("token_name", ""), bg="white", fg="#22495e", font=("Segoe UI", 11, "bold")).grid(row=row_idx, column=1, sticky="w", padx=(0, 8), pady=10)
+            token_name = defaults.get("token_name", "")
+            token_text = {"textvariable": token_name} if isinstance(token_name, tk.Variable) else {"text": token_name}
+            tk.Label(form_frame, bg="white", fg="#22495e", font=("Segoe UI", 11, "bold"), **token_text).grid(row=row_idx, column=1, sticky="w", padx=(0, 8), pady=10)
             row_idx += 1
             tk.Label(form_frame, text="Key", bg="white", fg=ACCENT).grid(row=row_idx, column=0, sticky="e", padx=(16, 8), pady=10)
             key_var = tk.StringVar(value=defaults.get("key", ""))
@@ -436,9 +739,6 @@ class DashboardApp:
             if not dll_path:
                 dll_error_var.set("DLL path is required")
                 has_error = True
-            elif not os.path.isfile(dll_path):
-                dll_error_var.set("Please select a valid file path")
-                has_error = True
 
             if not token_name:
                 token_error_var.set("Token name is required")
@@ -447,13 +747,20 @@ class DashboardApp:
             if has_error:
                 return
 
-            values = {
-                "dll_path": dll_path,
-                "token_name": token_name,
-            }
-            if include_active:
-                values["active"] = active_var.get()
-            on_submit(values)
+            def on_checked(is_file):
+                if not is_file:
+                    dll_error_var.set("Please select a valid file path")
+                    return
+                values = {
+                    "dll_path": dll_path,
+                    "token_name": token_name,
+                }
+                if include_active:
+                    values["active"] = active_var.get()
+                on_submit(values)
+
+            # The path may be on a slow or network drive; check it off the Tk thread.
+            self.runner.submit(os.path.isfile, dll_path, on_success=on_checked, owner=form_frame)
 
         actions = tk.Frame(form_frame, bg="white")
         actions.grid(row=row_idx, column=1, columnspan=2, pady=16, sticky="w", padx=(0, 8))
@@ -476,11 +783,104 @@ class DashboardApp:
     def delete_profile(self, profile_id):
         confirm = messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this profile?")
         if confirm:
-            delete_profile(profile_id)
+            self._write_profile(delete_profile, profile_id, success_message="Profile deleted successfully!")
 
-            messagebox.showinfo("Success", "Profile deleted successfully!")
+    def _write_profile(self, func, *args, success_message):
+        # The write runs on the runner; until it commits the current view
+        # stays up, with a busy cursor, and further saves are ignored.
+        if self._saving:
+            return
+        self._saving = True
+        self.root.config(cursor="watch")
+        # Forms are destroyed when left, so identity tells whether the user
+        # is still on the form that started this save.
+        origin = self._current_view
+
+        def finish():
+            self._saving = False
+            self.root.config(cursor="")
+
+        def on_saved(_):
+            finish()
+            messagebox.showinfo("Success", success_message)
+            if self._current_view is origin:
+                self.show_profiles()
+            else:
+                # The user moved on meanwhile; update the view they are on
+                # (a hidden Profiles view refreshes when next shown).
+                self.refresh_view()
+
+        def on_failed(e):
+            finish()
+            messagebox.showerror("Error", f"Could not save changes: {e}")
+
+        self.runner.submit(func, *args, on_success=on_saved, on_error=on_failed)
+
+    def _show_background_error(self, error):
+        messagebox.showerror("Error", str(error))
+
+    def import_profiles(self):
+        path = fd.askopenfilename(title="Import Profiles", filetypes=PROFILE_FILETYPES)
+        if not path:
+            return
+
+        def on_done(result):
+            message = f"Imported {result.imported} profiles."
+            if result.skipped:
+                details = "\n".join(f"Line {n}: {reason}" for n, reason in result.skipped[:10])
+                more = f"\n... and {len(result.skipped) - 10} more" if len(result.skipped) > 10 else ""
+                message += f"\n\nSkipped {len(result.skipped)}:\n{details}{more}"
+            messagebox.showinfo("Import Complete", message)
             self.show_profiles()
 
+        self._run_bulk_job("Importing", lambda progress: bulk.import_profiles(path, progress=progress), on_done)
+
+    def export_profiles(self):
+        path = fd.asksaveasfilename(title="Export Profiles", defaultextension=".csv", filetypes=PROFILE_FILETYPES)
+        if not path:
+            return
+
+        def on_done(count):
+            messagebox.showinfo("Export Complete", f"Exported {count} profiles to {path}")
+
+        self._run_bulk_job("Exporting", lambda progress: bulk.export_profiles(path, progress=progress), on_done)
+
+    def _run_bulk_job(self, label, job, on_done):
+        if self._bulk_running:
+            messagebox.showwarning("Busy", "An import or export is already running.")
+            return
+        self._bulk_running = True
+
+        def show_progress(done, fraction):
+            if self._bulk_running:
+                self.bulk_status_var.set(f"{label}... {done} rows ({fraction:.0%})")
+
+        def report(done, fraction):
+            # Called on the worker thread; hand the update to the Tk thread.
+            self.runner.post(show_progress, done, fraction)
+
+        def on_success(result):
+            self._bulk_running = False
+            self.bulk_status_var.set("")
+            on_done(result)
+
+        def on_error(e):
+            self._bulk_running = False
+            self.bulk_status_var.set("")
+            messagebox.showerror(f"{label} Failed", str(e))
+
+        self.bulk_status_var.set(f"{label}...")
+        self.runner.submit(job, report, on_success=on_success, on_error=on_error)
+
     def close_app(self):
+        self.runner.shutdown()
+        if self._live_job is not None:
+            self.root.after_cancel(self._live_job)
+        if self._live_subscriber is not None:
+            # Closing joins the listener thread; don't hold up the window.
+            threading.Thread(target=self._live_subscriber.close, daemon=True).start()
         self.root.destroy()
-        self.root.quit()
+        # Hosted in a Toplevel (see DashboardLauncher), the event loop
+        # belongs to someone else and must keep running.
+        if isinstance(self.root, tk.Tk):
+            self.root.quit()
@@ -3,55 +3,32 @@ UI Dashboard Launcher - Opens Tkinter dashboard when specific events are receive
 """
 import tkinter as tk
 from tkinter import messagebox
+import json
 import logging
+import queue
 import threading
+import time
+from collections import deque
 from typing import Dict, Any
 from datetime import datetime
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds covered by the "events in the last second" summary.
+RATE_WINDOW = 1.0
 
-class EventNotificationWindow:
-    """A simple notification window that appears when events are received."""
-    
-    _open_windows = 0
-    _max_windows = 3  # Limit concurrent windows
+
+class _NotificationWindow:
+    """One notification window, reused for every event of its category."""
     
-    @staticmethod
-    def create_notification(event_type: str, event_data: Dict[str, Any]):
-        """Create a notification window for an event."""
-        if EventNotificationWindow._open_windows >= EventNotificationWindow._max_windows:
-            logger.warning("Too many notification windows open")
-            return
-        
-        EventNotificationWindow._open_windows += 1
-        logger.info(f"Creating notification window for event: {event_type}")
-        
-        # Create window in a new thread to avoid blocking
-        def show_window():
-            try:
-                root = tk.Tk()
-                root.withdraw()  # Hide main window
-                
-                # Create modal notification
-                EventNotificationWindow._create_modal_notification(
-                    root, event_type, event_data
-                )
-            except Exception as e:
-                logger.error(f"Error showing notification window: {e}", exc_info=True)
-            finally:
-                EventNotificationWindow._open_windows -= 1
+    def __init__(self, root, title: str):
+        self.title = title
+        self.total = 0
+        self.recent = deque()  # (monotonic time, count) per batch, last RATE_WINDOW seconds
         
-        thread = threading.Thread(target=show_window, daemon=False)
-        thread.start()
-        logger.info("Notification thread started")
-    
-    @staticmethod
-    def _create_modal_notification(parent, event_type: str, event_data: Dict[str, Any]):
-        """Create and show a modal notification dialog."""
-        # Create a toplevel window
-        top = tk.Toplevel(parent)
+        top = tk.Toplevel(root)
+        self.top = top
         top.title("Event Notification")
         top.geometry("500x400")
         top.resizable(False, False)
@@ -59,16 +36,12 @@ class EventNotificationWindow:
         # Configure styling
         top.configure(bg="#f6f8fa")
         
-        # Center the window
-        top.update_idletasks()
-        x = (top.winfo_screenwidth() // 2) - (500 // 2)
-        y = (top.winfo_screenheight() // 2) - (400 // 2)
+        # Center the window, cascading when several are open
+        offset = 30 * (len(root.winfo_children()) - 1)
+        x = (top.winfo_screenwidth() // 2) - (500 // 2) + offset
+        y = (top.winfo_screenheight() // 2) - (400 // 2) + offset
         top.geometry(f"500x400+{x}+{y}")
         
-        # Make it modal
-        top.transient(parent)
-        top.grab_set()
-        
         # Header
         header_frame = tk.Frame(top, bg="#2a5b74", height=60)
         header_frame.pack(fill="x")
@@ -96,34 +69,27 @@ class EventNotificationWindow:
         
         tk.Label(
             content_frame,
-            text=event_type,
+            text=title,
             font=("Segoe UI", 10),
             bg="#f6f8fa",
             fg="#2a5b74"
         ).pack(anchor="w", pady=(5, 15))
         
-        # Timestamp
-        timestamp = event_data.get('timestamp', datetime.now().isoformat())
+        # Count and timestamp of the latest event
+        self.summary_var = tk.StringVar()
         tk.Label(
             content_frame,
-            text="Received:",
+            textvariable=self.summary_var,
             font=("Segoe UI", 9),
             bg="#f6f8fa",
-            fg="#666"
-        ).pack(anchor="w")
-        
-        tk.Label(
-            content_frame,
-            text=timestamp,
-            font=("Segoe UI", 9),
-            bg="#f6f8fa",
-            fg="#666"
-        ).pack(anchor="w", pady=(5, 15))
+            fg="#666",
+            justify="left"
+        ).pack(anchor="w", pady=(0, 15))
         
         # Event data (scrollable)
         tk.Label(
             content_frame,
-            text="Event Data:",
+            text="Latest Event Data:",
             font=("Segoe UI", 10, "bold"),
             bg="#f6f8fa"
         ).pack(anchor="w")
@@ -135,7 +101,7 @@ class EventNotificationWindow:
         scrollbar = tk.Scrollbar(scroll_frame)
         scrollbar.pack(side="right", fill="y")
         
-        text_area = tk.Text(
+        self.text_area = tk.Text(
             scroll_frame,
             wrap="word",
             font=("Consolas", 9),
@@ -146,29 +112,18 @@ class EventNotificationWindow:
             pady=10,
             height=10
         )
-        text_area.pack(side="left", fill="both", expand=True)
-        scrollbar.config(command=text_area.yview)
-        
-        # Insert formatted event data
-        import json
-        formatted_data = json.dumps(event_data, indent=2)
-        text_area.insert("1.0", formatted_data)
-        text_area.config(state="disabled")  # Make read-only
+        self.text_area.pack(side="left", fill="both", expand=True)
+        scrollbar.config(command=self.text_area.yview)
         
         # Button frame
         button_frame = tk.Frame(top, bg="#f6f8fa", pady=10)
         button_frame.pack(fill="x")
         
-        def close_window():
-            top.destroy()
-            parent.quit()
-            parent.destroy()
-        
         # Close button
         close_btn = tk.Button(
             button_frame,
             text="Close",
-            command=close_window,
+            command=top.destroy,
             font=("Segoe UI", 10, "bold"),
             bg="#43a047",
             fg="white",
@@ -179,47 +134,294 @@ class EventNotificationWindow:
             relief="flat"
         )
         close_btn.pack()
-        
-        # Handle window close
-        top.protocol("WM_DELETE_WINDOW", close_window)
-        
-        # Focus the window
         top.focus_force()
+    
+    def exists(self) -> bool:
+        return bool(self.top.winfo_exists())
+    
+    def add(self, count: int, event_data: Dict[str, Any], received: str):
+        """Fold a batch of `count` events into the window, showing the latest one."""
+        self.total += count
+        self.recent.append((time.monotonic(), count))
+        self.latest_received = received
         
-        # Run the notification
-        parent.mainloop()
+        # Only the newest event is rendered, so a storm costs one redraw per batch.
+        self.text_area.config(state="normal")
+        self.text_area.delete("1.0", "end")
+        self.text_area.insert("1.0", json.dumps(event_data, indent=2, default=str))
+        self.text_area.config(state="disabled")
+        self.refresh_summary()
+    
+    def refresh_summary(self):
+        cutoff = time.monotonic() - RATE_WINDOW
+        while self.recent and self.recent[0][0] < cutoff:
+            self.recent.popleft()
+        last_second = sum(count for _, count in self.recent)
+        if self.total == 1:
+            summary = f"Received: {self.latest_received}"
+        else:
+            summary = (f"{last_second} events in the last second, {self.total} in total\n"
+                       f"Latest received: {self.latest_received}")
+        if summary != self.summary_var.get():
+            self.summary_var.set(summary)
 
 
-class DashboardLauncher:
-    """Launches the full dashboard when events require it."""
+class NotificationManager:
+    """
+    Shows every event notification from one long-lived UI thread.
     
-    @staticmethod
-    def launch_full_dashboard(event_type: str, event_data: Dict[str, Any]):
-        """Launch the full dashboard application."""
-        def launch():
+    The thread owns a single hidden Tk root. Producers only enqueue; the UI
+    thread drains the queue every POLL_INTERVAL_MS and folds each batch into
+    one window per event category (at most MAX_WINDOWS, the rest sharing an
+    "Other events" window), so an event storm renders in constant time and
+    memory.
+    """
+    
+    MAX_WINDOWS = 3
+    MAX_PENDING = 1000
+    POLL_INTERVAL_MS = 250
+    OVERFLOW_TITLE = "Other events"
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    @classmethod
+    def instance(cls) -> 'NotificationManager':
+        """The process-wide manager (created on first use)."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+    
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=self.MAX_PENDING)
+        self._calls = queue.Queue()
+        self._lock = threading.Lock()
+        self._dropped = 0
+        self._thread = None
+        self._failed = False
+        self._stopping = False
+        self._windows = {}  # category -> _NotificationWindow (UI thread only)
+        self.root = None
+    
+    def start(self):
+        """Start the UI thread if it is not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="notification-ui", daemon=True)
+            self._thread.start()
+    
+    def notify(self, title: str, event_data: Dict[str, Any]):
+        """Queue a notification; safe to call from any thread and never blocks."""
+        if self._failed:
+            return
+        self.start()
+        received = event_data.get('timestamp') or datetime.now().isoformat()
+        try:
+            self._queue.put_nowait((title, event_data, received))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+    
+    @property
+    def failed(self) -> bool:
+        """True once the UI thread found no display; nothing is shown after that."""
+        return self._failed
+    
+    def call_soon(self, callback, *args):
+        """
+        Run callback(*args) on the UI thread at its next tick; safe from any thread.
+        
+        A callback queued just before the UI thread fails to start is
+        dropped; callers holding state for it should check `failed` later.
+        
+        Returns:
+            bool: False if there is no UI thread (no display), else True
+        """
+        if self._failed:
+            return False
+        self.start()
+        self._calls.put((callback, args))
+        if self._failed:
+            # _run failed meanwhile and may already have discarded the queue.
+            self._discard_calls()
+            return False
+        return True
+    
+    def _discard_calls(self):
+        while True:
             try:
-                from ui.dashboard import DashboardApp
-                import tkinter as tk
-                
-                root = tk.Tk()
-                app = DashboardApp(root)
-                
-                # Show a message about why this dashboard opened
-                messagebox.showinfo(
-                    "Dashboard Opened by Event",
-                    f"Dashboard opened due to event: {event_type}\n\n"
-                    f"Check the event data in the console for details."
-                )
-                
-                logger.info(f"Launched full dashboard for event: {event_type}")
-                
-                root.mainloop()
+                self._calls.get_nowait()
+            except queue.Empty:
+                return
+    
+    def stop(self):
+        """Close every notification and end the UI thread."""
+        self._stopping = True
+    
+    def _run(self):
+        try:
+            self.root = tk.Tk()
+            self.root.withdraw()  # Hide main window
+        except tk.TclError as e:
+            logger.error(f"Notifications disabled, cannot open a display: {e}")
+            self._failed = True
+            self._discard_calls()
+            return
+        self.root.after(self.POLL_INTERVAL_MS, self._drain)
+        self.root.mainloop()
+        self.root.destroy()
+        self.root = None
+        self._windows.clear()
+    
+    def _drain(self):
+        if self._stopping:
+            self.root.quit()
+            return
+        
+        while True:
+            try:
+                callback, args = self._calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
             except Exception as e:
-                logger.error(f"Error launching dashboard: {e}")
+                logger.error(f"Error in UI callback: {e}", exc_info=True)
+        
+        # Coalesce everything queued since the last tick: count per
+        # category and keep only the newest event.
+        batch = {}
+        while True:
+            try:
+                title, event_data, received = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            count = batch[title][0] + 1 if title in batch else 1
+            batch[title] = (count, event_data, received)
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            logger.warning(f"{dropped} notifications dropped while the UI thread was behind")
+        
+        self._windows = {title: w for title, w in self._windows.items() if w.exists()}
+        for title, (count, event_data, received) in batch.items():
+            self._window_for(title).add(count, event_data, received)
+        for window in self._windows.values():
+            window.refresh_summary()
+        
+        self.root.after(self.POLL_INTERVAL_MS, self._drain)
+    
+    def _window_for(self, title: str) -> _NotificationWindow:
+        window = self._windows.get(title)
+        if window is None:
+            if len(self._windows) >= self.MAX_WINDOWS:
+                title = self.OVERFLOW_TITLE
+                window = self._windows.get(title)
+            if window is None:
+                logger.info(f"Creating notification window for event: {title}")
+                window = self._windows[title] = _NotificationWindow(self.root, title)
+        return window
+
+
+class EventNotificationWindow:
+    """A simple notification window that appears when events are received."""
+    
+    @staticmethod
+    def create_notification(event_type: str, event_data: Dict[str, Any]):
+        """Show a notification for an event (see NotificationManager)."""
+        NotificationManager.instance().notify(event_type, event_data)
+
+
+class DashboardLauncher:
+    """
+    Opens the full dashboard when events require it.
+    
+    There is at most one dashboard per process. It is a Toplevel of the
+    NotificationManager's Tk root, so it shares that UI thread instead of
+    starting another Tk interpreter. Launch requests are debounced: the first
+    one opens (or focuses) the dashboard DEBOUNCE_MS later, and every request
+    arriving meanwhile is folded into that single launch. Once the dashboard
+    is open, further events refresh its current view in place.
+    """
+    
+    DEBOUNCE_MS = 500
+    
+    _lock = threading.Lock()
+    # Requests since the last launch: only their number and the latest
+    # event are kept, so a storm costs constant memory.
+    _pending_count = 0
+    _latest_event = None  # event_type
+    _scheduled = False
+    _app = None           # DashboardApp (UI thread only)
+    
+    @classmethod
+    def launch_full_dashboard(cls, event_type: str, event_data: Dict[str, Any]):
+        """Open the dashboard, or focus and refresh it; safe to call from any thread."""
+        manager = NotificationManager.instance()
+        with cls._lock:
+            if manager.failed:
+                # No display: a scheduled launch will never run.
+                cls._reset()
+                return
+            cls._pending_count += 1
+            cls._latest_event = event_type
+            if cls._scheduled:
+                return
+            cls._scheduled = True
+        if not manager.call_soon(cls._schedule):
+            with cls._lock:
+                cls._reset()
+    
+    @classmethod
+    def _reset(cls):
+        cls._pending_count = 0
+        cls._latest_event = None
+        cls._scheduled = False
+    
+    @classmethod
+    def _schedule(cls):
+        NotificationManager.instance().root.after(cls.DEBOUNCE_MS, cls._launch)
+    
+    @classmethod
+    def _launch(cls):
+        with cls._lock:
+            count, event_type = cls._pending_count, cls._latest_event
+            cls._reset()
+        if not count:
+            return
         
-        # Launch in a separate thread to avoid blocking
-        thread = threading.Thread(target=launch, daemon=True)
-        thread.start()
+        try:
+            app = cls._app
+            if app is not None and app.root.winfo_exists():
+                # Live profile events already update the cache; the view
+                # only needs to pick up the new rows.
+                app.refresh_view()
+                app.root.deiconify()
+                app.root.lift()
+                app.root.focus_force()
+                logger.info(f"Refreshed dashboard for {count} event(s), latest: {event_type}")
+                return
+            
+            from ui.dashboard import DashboardApp
+            
+            top = tk.Toplevel(NotificationManager.instance().root)
+            cls._app = DashboardApp(top)
+            
+            # Show a message about why this dashboard opened
+            reason = event_type if count == 1 else f"{event_type} (and {count - 1} more)"
+            messagebox.showinfo(
+                "Dashboard Opened by Event",
+                f"Dashboard opened due to event: {reason}\n\n"
+                f"Check the event data in the console for details.",
+                parent=top
+            )
+            
+            logger.info(f"Launched full dashboard for event: {reason}")
+        except Exception as e:
+            logger.error(f"Error launching dashboard: {e}")
 
 
 def create_event_handler(launch_type='notification'):
@@ -0,0 +1,96 @@
+"""
+Startup timing for the dashboard entry point.
+
+``python main.py --startup-report`` records when each startup phase finished,
+measured from the moment this module was imported (main.py imports it
+first), and prints the phases together with the slowest imports once the
+dashboard has loaded its first data. Without the flag every call is a no-op.
+"""
+import os
+import subprocess
+import sys
+import threading
+import time
+
+_started = time.perf_counter()
+_phases = []
+_enabled = False
+
+
+def enable():
+    """Start recording phases."""
+    global _enabled
+    _enabled = True
+
+
+def mark(phase: str):
+    """Record that a startup phase has finished."""
+    if _enabled:
+        _phases.append((phase, time.perf_counter()))
+
+
+def finish(phase: str):
+    """Record the last phase, stop recording and print the report."""
+    global _enabled
+    if not _enabled:
+        return
+    mark(phase)
+    _enabled = False
+    # Profiling the imports runs a child interpreter (up to 30 s); keep it
+    # off the Tk thread. Not a daemon, so closing the window early still
+    # lets the report print before the process exits.
+    threading.Thread(target=lambda: print(report(), flush=True),
+                     name="startup-report").start()
+
+
+def report(module: str = "ui.dashboard", top: int = 10) -> str:
+    """
+    Format the recorded phases and the slowest imports of a module.
+
+    Args:
+        module: Module whose imports are profiled (default: ui.dashboard)
+        top: Number of modules listed (default: 10)
+
+    Returns:
+        str: The report
+    """
+    lines = ["Startup phases (ms since start / ms in phase):"]
+    previous = _started
+    for phase, at in _phases:
+        lines.append(f"  {(at - _started) * 1000:8.1f} {(at - previous) * 1000:8.1f}  {phase}")
+        previous = at
+
+    imports = import_times(module)
+    if imports:
+        total = max(cumulative for _, cumulative, _ in imports)
+        lines.append(f"Slowest imports (self / cumulative ms; import {module} took {total / 1000:.1f} ms):")
+        for self_us, cumulative, name in sorted(imports, reverse=True)[:top]:
+            lines.append(f"  {self_us / 1000:8.1f} {cumulative / 1000:8.1f}  {name}")
+    return "\n".join(lines)
+
+
+def import_times(module: str):
+    """
+    Per-module import times of `module` as (self us, cumulative us, name).
+
+    ``-X importtime`` only reports imports done by a fresh interpreter, so the
+    module is imported again in a child process.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=root, capture_output=True, text=True, timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return []
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            rows.append((int(fields[0]), int(fields[1]), fields[2].strip()))
+        except (IndexError, ValueError):
+            continue  # the header row
+    return rows